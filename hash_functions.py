@@ -0,0 +1,241 @@
+# Description: This script contains hash functions for use with any of the HashMaps, as a replacement for the sample
+# hash_function_1 and hash_function_2. Every function takes a key and returns an integer from 0 to 2**64 - 1. FNV-1a,
+# SipHash-2-4, BLAKE2b and SeededHash hash the bytes of string, bytes, integer and float keys, giving keys that
+# compare equal the same hash (so 1, 1.0 and True hash alike), and raise TypeError for any other key. The module also
+# provides distribution_report, which measures how evenly a function spreads a set of keys over a number of buckets,
+# and SeededHash, a randomly keyed function that the separate chaining and open addressing HashMaps reseed on their
+# own when a flood of colliding keys makes a chain or probe sequence grow too long.
+
+
+import hashlib
+import os
+import struct
+
+from hash_map_include import hash_function_1, hash_function_2
+from hash_map_support import mix_hash
+
+
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def _to_bytes(key) -> bytes:
+    """
+    Takes a key as a parameter. Returns the bytes that are hashed for it: bytes as they are, strings as UTF-8,
+    integers (and so bools) as little-endian two's complement, and floats as the equal integer if they are whole or
+    else as their little-endian IEEE 754 double. Keys that compare equal give the same bytes. Raises TypeError for
+    any other key.
+    """
+    if isinstance(key, bytes):
+        return key
+    if isinstance(key, str):
+        return key.encode('utf-8')
+    if isinstance(key, float) and key.is_integer():
+        key = int(key)
+    if isinstance(key, int):
+        return key.to_bytes(key.bit_length() // 8 + 1, 'little', signed=True)
+    if isinstance(key, float):
+        return struct.pack('<d', key)
+    raise TypeError('Unsupported key type ' + type(key).__name__)
+
+
+def fnv1a_64(key) -> int:
+    """
+    Takes a key as a parameter. Returns the 64 bit FNV-1a hash of its bytes. Simple and stable across processes and
+    platforms, with good distribution for short keys, but it runs a Python loop over every byte.
+    """
+    hash = _FNV_OFFSET
+    for byte in _to_bytes(key):
+        hash = ((hash ^ byte) * _FNV_PRIME) & _MASK
+    return hash
+
+
+def _rotate(value: int, bits: int) -> int:
+    """Rotate a 64 bit value left by the given number of bits."""
+    return ((value << bits) | (value >> (64 - bits))) & _MASK
+
+
+def siphash24(key, k0: int = 0, k1: int = 0) -> int:
+    """
+    Takes a key and an optional 128 bit secret as two 64 bit integers as parameters. Returns the SipHash-2-4 of the
+    key's bytes. With a random secret the hashes cannot be predicted by whoever chooses the keys. Pure Python, so it is
+    the slowest function here; blake2b_64 gives the same protection much faster.
+    """
+    data = _to_bytes(key)
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def rounds(v0: int, v1: int, v2: int, v3: int, count: int) -> (int, int, int, int):
+        for _ in range(count):
+            v0 = (v0 + v1) & _MASK
+            v1 = _rotate(v1, 13) ^ v0
+            v0 = _rotate(v0, 32)
+            v2 = (v2 + v3) & _MASK
+            v3 = _rotate(v3, 16) ^ v2
+            v0 = (v0 + v3) & _MASK
+            v3 = _rotate(v3, 21) ^ v0
+            v2 = (v2 + v1) & _MASK
+            v1 = _rotate(v1, 17) ^ v2
+            v2 = _rotate(v2, 32)
+        return v0, v1, v2, v3
+
+    # Compress every full 8 byte word, then the last partial word with the length in its top byte
+    length = len(data)
+    end = length - length % 8
+    for word, in struct.iter_unpack('<Q', data[:end]):
+        v3 ^= word
+        v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 2)
+        v0 ^= word
+    last = int.from_bytes(data[end:], 'little') | ((length & 0xFF) << 56)
+    v3 ^= last
+    v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 2)
+    v0 ^= last
+
+    # Finalize
+    v2 ^= 0xFF
+    v0, v1, v2, v3 = rounds(v0, v1, v2, v3, 4)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def blake2b_64(key, secret: bytes = b'') -> int:
+    """
+    Takes a key and an optional secret of up to 64 bytes as parameters. Returns the first 64 bits of the keyed BLAKE2b
+    hash of the key's bytes. Runs in C, is stable across processes and, with a random secret, resists keys chosen to
+    collide.
+    """
+    return int.from_bytes(hashlib.blake2b(_to_bytes(key), digest_size=8, key=secret).digest(), 'little')
+
+
+def builtin_hash(key) -> int:
+    """
+    Takes a hashable key as a parameter. Returns Python's built-in hash of the key as an unsigned 64 bit integer. This
+    is the fastest function here and string hashes are randomly seeded, but for the same reason string hashes differ
+    between processes, so it should not be used for anything saved to disk or shared between processes.
+    """
+    return hash(key) & _MASK
+
+
+def fmix64(key: int) -> int:
+    """
+    Takes an integer key as a parameter. Returns the MurmurHash3 64 bit finalizer of it, which spreads every input bit
+    over the whole output. Suited to integer keys, such as sequential IDs, that differ only in a few bits.
+    """
+    return mix_hash(key)
+
+
+def splitmix64(key: int) -> int:
+    """
+    Takes an integer key as a parameter. Returns the SplitMix64 mix of it, which adds a constant before mixing so that
+    0 does not hash to 0.
+    """
+    hash = (key + 0x9E3779B97F4A7C15) & _MASK
+    hash = ((hash ^ (hash >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    hash = ((hash ^ (hash >> 27)) * 0x94D049BB133111EB) & _MASK
+    return hash ^ (hash >> 31)
+
+
+class SeededHash:
+    """
+    Keyed BLAKE2b hash function with its own random secret. Keys cannot be chosen to collide without knowing the
+    secret, and a HashMap that finds a suspiciously long chain or probe sequence calls reseeded to switch to a new one.
+    """
+
+    def __init__(self, secret: bytes = None) -> None:
+        """
+        Initialize new SeededHash with the given secret of up to 64 bytes, or with 16 random bytes if none is given
+        """
+        self._secret = secret if secret is not None else os.urandom(16)
+
+    def __call__(self, key) -> int:
+        """
+        Takes a key as a parameter. Returns the first 64 bits of the keyed BLAKE2b hash of the key's bytes.
+        """
+        return int.from_bytes(hashlib.blake2b(_to_bytes(key), digest_size=8, key=self._secret).digest(), 'little')
+
+    def reseeded(self) -> "SeededHash":
+        """
+        Takes no parameters. Returns a new SeededHash with a fresh random secret. The function itself is left
+        unchanged, so maps that share it are not affected.
+        """
+        return type(self)()
+
+
+def distribution_report(function, keys, buckets: int) -> dict:
+    """
+    Takes a hash function, an iterable of distinct keys and a number of buckets as parameters. Places every key in
+    the bucket given by its hash modulo the number of buckets, as the separate chaining HashMap does, and measures
+    the result against a uniformly random placement. Returns a dictionary with:
+
+    keys, buckets and load: the number of keys, the number of buckets and keys per bucket
+    empty_buckets and expected_empty: the buckets left empty, and how many a uniform hash would leave empty
+    longest_chain: the most keys in one bucket
+    average_probes: the average number of keys compared in a successful lookup, 1 + load / 2 for a uniform hash
+    chi_square: the chi-squared statistic of the bucket counts divided by its degrees of freedom, close to 1 for a
+    uniform hash and much larger for a clustered one
+    hash_collisions: the number of keys whose full hash equals the hash of an earlier key
+    """
+    buckets = max(buckets, 1)
+    counts = [0] * buckets
+    seen = set()
+    total = 0
+    collisions = 0
+    for key in keys:
+        hash = function(key)
+        if hash in seen:
+            collisions += 1
+        else:
+            seen.add(hash)
+        counts[hash % buckets] += 1
+        total += 1
+
+    # A successful lookup compares the keys before it in its chain, so a chain of length c costs c * (c + 1) / 2
+    load = total / buckets
+    chi_square = sum((count - load) ** 2 for count in counts) / load if load else 0.0
+    return {
+        'keys': total,
+        'buckets': buckets,
+        'load': load,
+        'empty_buckets': counts.count(0),
+        'expected_empty': buckets * (1 - 1 / buckets) ** total,
+        'longest_chain': max(counts),
+        'average_probes': sum(count * (count + 1) / 2 for count in counts) / total if total else 0.0,
+        'chi_square': chi_square / (buckets - 1) if buckets > 1 else 0.0,
+        'hash_collisions': collisions,
+    }
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nhash values example")
+    print("-------------------")
+    for function in (fnv1a_64, siphash24, blake2b_64, fmix64, splitmix64):
+        print(function.__name__, function(12) if function in (fmix64, splitmix64) else function('str12'))
+
+    print("\ndistribution_report example")
+    print("---------------------------")
+    keys = ['str' + str(i) for i in range(5000)]
+    for function in (hash_function_2, fnv1a_64, siphash24, blake2b_64, builtin_hash):
+        report = distribution_report(function, keys, 1024)
+        print(f"{function.__name__:>16}: longest chain {report['longest_chain']:4}, "
+              f"empty {report['empty_buckets']:4} (expected {report['expected_empty']:.0f}), "
+              f"probes {report['average_probes']:6.2f}, chi-square {report['chi_square']:7.2f}, "
+              f"collisions {report['hash_collisions']}")
+    keys = list(range(0, 5000 * 1024, 1024))
+    for function in (hash_function_1, fmix64, splitmix64):
+        report = distribution_report(function, keys, 1024)
+        print(f"{function.__name__:>16}: longest chain {report['longest_chain']:4}, "
+              f"empty {report['empty_buckets']:4} (expected {report['expected_empty']:.0f}), "
+              f"probes {report['average_probes']:6.2f}, chi-square {report['chi_square']:7.2f}, "
+              f"collisions {report['hash_collisions']}")
+
+    print("\nSeededHash example")
+    print("------------------")
+    seeded = SeededHash(b'secret')
+    print(seeded('str12'), seeded('str12') == blake2b_64('str12', b'secret'))
+    print(seeded.reseeded()('str12') != seeded('str12'))
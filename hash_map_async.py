@@ -0,0 +1,255 @@
+# Description: This script contains an AsyncHashMap class that lets an asyncio program use either HashMap without
+# blocking the event loop for long. Single operations are short and run straight away. Resizing, clearing and bulk
+# loading are split into chunks with a yield to the event loop after each one: new bucket arrays are allocated a chunk
+# at a time, entries are moved with the incremental resize of the wrapped map, and old arrays are released a chunk at a
+# time. Other coroutines can keep reading and writing the map between chunks.
+
+
+import asyncio
+
+from hash_map_include import DynamicArray, LinkedList, hash_function_2
+from hash_map_support import next_power_of_two
+from hash_map_sc import HashMap
+import hash_map_oa
+
+
+class AsyncHashMap:
+
+    # Number of buckets allocated, migrated or released, or keys loaded, between yields to the event loop
+    _chunk_size = 4096
+
+    # Number of old buckets the wrapped map migrates on each operation while a resize started by put is in progress
+    _migrate_step = 4
+
+    def __init__(self, capacity: int, function, map_class=HashMap) -> None:
+        """
+        Initialize new AsyncHashMap wrapping a new separate chaining or open addressing HashMap. The wrapped map uses
+        incremental resizing, so growth triggered by put moves its entries a few buckets at a time.
+        """
+        self._map = map_class(capacity, function)
+        self._map.set_incremental_resize(self._migrate_step)
+        self._open_addressing = isinstance(self._map, hash_map_oa.HashMap)
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    async def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the HashMap. Returns None.
+        """
+        self._map.put(key, value)
+
+    async def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        return self._map.get(key)
+
+    async def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        return self._map.contains_key(key)
+
+    async def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. Returns None.
+        """
+        self._map.remove(key)
+
+    async def _allocate(self, capacity: int) -> DynamicArray:
+        """
+        Takes an integer capacity as a parameter. Builds an empty bucket array of that capacity for the wrapped map,
+        yielding to the event loop after each chunk. Returns the DA.
+        """
+        new_da = DynamicArray()
+        for start in range(0, capacity, self._chunk_size):
+            for _ in range(start, min(start + self._chunk_size, capacity)):
+                new_da.append(None if self._open_addressing else LinkedList())
+            await asyncio.sleep(0)
+        return new_da
+
+    async def _release(self, old_da: DynamicArray) -> None:
+        """
+        Takes a bucket array that is no longer installed in the wrapped map as a parameter. Empties it from the end a
+        chunk at a time, yielding to the event loop after each chunk, so its entries are freed gradually. Returns None.
+        """
+        while old_da.length():
+            for _ in range(min(self._chunk_size, old_da.length())):
+                old_da.pop()
+            await asyncio.sleep(0)
+
+    async def _drain(self) -> None:
+        """
+        Takes no parameters. Finishes any incremental resize of the wrapped map a chunk of buckets at a time, yielding
+        to the event loop after each chunk, then releases the old array gradually. A put made while releasing may
+        start another resize, so this repeats until none is in progress, and no resize is in progress when it
+        returns. Returns None.
+        """
+        while self._map.migration_source() is not None:
+            old_da = self._map.migration_source()
+            while self._map.migration_source() is not None:
+                self._map.migrate_step(self._chunk_size)
+                await asyncio.sleep(0)
+            await self._release(old_da)
+
+    async def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Allocates the new bucket array,
+        moves every entry into it and releases the old array, all in chunks with a yield to the event loop after each
+        one. The map can be used by other coroutines in between. Returns None.
+        """
+        async with self._lock:
+            await self._drain()
+
+            # Check the new capacity as the wrapped map would
+            if new_capacity < 1:
+                return
+            if self._open_addressing:
+                if new_capacity < self._map.get_size():
+                    return
+                new_capacity = next_power_of_two(new_capacity)
+
+            new_da = await self._allocate(new_capacity)
+
+            # A resize started by put while allocating must finish before the new array is installed, and puts may
+            # have filled the map beyond the new capacity in the meantime
+            await self._drain()
+            if self._open_addressing and new_capacity < self._map.get_size():
+                return
+            self._map.begin_resize(new_da)
+            await self._drain()
+
+    async def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values. The empty array is allocated and the old entries are
+        released in chunks with a yield to the event loop after each one; the map is empty from the moment the new
+        array is installed. Returns None
+        """
+        async with self._lock:
+
+            # Allocate again if a put resized the map while the array was being built
+            new_da = await self._allocate(self._map.get_capacity())
+            while new_da.length() != self._map.get_capacity():
+                new_da = await self._allocate(self._map.get_capacity())
+            for old_da in self._map.reset(new_da):
+                await self._release(old_da)
+
+    async def _chunks(self, items):
+        """
+        Takes an iterable or an async iterable as a parameter. Async generator that yields it as lists of at most
+        _chunk_size items.
+        """
+        chunk = []
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                chunk.append(item)
+                if len(chunk) == self._chunk_size:
+                    yield chunk
+                    chunk = []
+        else:
+            for item in items:
+                chunk.append(item)
+                if len(chunk) == self._chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    async def put_many(self, pairs) -> None:
+        """
+        Takes an iterable or async iterable of key,value pairs as a parameter. Puts the pairs into the HashMap a chunk
+        at a time with the wrapped map's put_many, yielding to the event loop after each chunk. Returns None.
+        """
+        async for chunk in self._chunks(pairs):
+            self._map.put_many(chunk)
+            await asyncio.sleep(0)
+
+    async def get_many(self, keys) -> list:
+        """
+        Takes an iterable or async iterable of keys as a parameter. Looks the keys up a chunk at a time, yielding to
+        the event loop after each chunk. Returns a list of the values in the same order as the keys, with None for
+        missing keys.
+        """
+        results = []
+        async for chunk in self._chunks(keys):
+            results.extend(self._map.get_many(chunk))
+            await asyncio.sleep(0)
+        return results
+
+    async def remove_many(self, keys) -> None:
+        """
+        Takes an iterable or async iterable of keys as a parameter and removes them a chunk at a time, yielding to the
+        event loop after each chunk. Missing keys are ignored. Returns None.
+        """
+        async for chunk in self._chunks(keys):
+            self._map.remove_many(chunk)
+            await asyncio.sleep(0)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table. Returns the DA.
+        """
+        return self._map.get_keys()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    async def heartbeat(ticks: list) -> None:
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main() -> None:
+        print("\nput_many / resize_table example")
+        print("-------------------------------")
+        m = AsyncHashMap(16, hash_function_2)
+        await m.put_many(('str' + str(i), i * 100) for i in range(2000))
+        print(m.get_size(), m.get_capacity(), await m.get('str150'), await m.contains_key('str2000'))
+
+        # The heartbeat keeps running while the table is resized and cleared
+        ticks = []
+        task = asyncio.create_task(heartbeat(ticks))
+        await m.resize_table(100000)
+        print(m.get_size(), m.get_capacity(), await m.get('str150'), len(ticks) > 1)
+        await m.clear()
+        print(m.get_size(), m.get_capacity(), await m.get('str150'))
+        task.cancel()
+
+        print("\nasync iterator example")
+        print("----------------------")
+
+        async def pairs():
+            for i in range(10):
+                yield i, i * 10
+                await asyncio.sleep(0)
+
+        m = AsyncHashMap(4, hash, hash_map_oa.HashMap)
+        await m.put_many(pairs())
+        await m.remove(3)
+        print(await m.get_many(range(5)), m.get_size())
+
+    asyncio.run(main())
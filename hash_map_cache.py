@@ -0,0 +1,365 @@
+# Description: This script contains a Cache class that bounds a separate chaining HashMap by number of entries and,
+# optionally, by total size in bytes, evicting the least recently used (LRU) or least frequently used (LFU) entry when
+# a bound is exceeded. The chain nodes of the HashMap are CacheNodes, which are also threaded onto doubly linked usage
+# lists: a single recency list for LRU, or one list per use count for LFU, so get, put and eviction are all constant
+# time and each cached key is a single object. Entries can also expire after a time to live. Hit, miss, eviction and
+# expiry counters are kept for tuning.
+
+
+import sys
+import time
+
+from hash_map_include import DynamicArray, SLNode, hash_function_2
+from hash_map_sc import HashMap
+
+
+class CacheNode(SLNode):
+    """
+    Chain node of the cache's HashMap that also holds its links in a usage list, use count, size in bytes and expiry
+    time
+    """
+
+    __slots__ = ('prev_use', 'next_use', 'uses', 'size', 'expires')
+
+    def __init__(self, key: str, value: object, next: SLNode = None, hash: int = None) -> None:
+        """Initialize node given a key, value and the full hash of the key."""
+        super().__init__(key, value, next, hash)
+        self.prev_use = None
+        self.next_use = None
+        self.uses = 1
+        self.size = 0
+        self.expires = None
+
+
+class CacheMap(HashMap):
+    """
+    Separate chaining HashMap whose chain nodes are CacheNodes
+    """
+
+    _node_class = CacheNode
+
+
+class EntryList:
+    """
+    Circular doubly linked list of CacheNode objects with a sentinel, ordered from least to most recently used
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty list."""
+        self._sentinel = CacheNode(None, None)
+        self._sentinel.prev_use = self._sentinel
+        self._sentinel.next_use = self._sentinel
+
+    def append(self, entry: CacheNode) -> None:
+        """Link an entry at the most recently used end."""
+        last = self._sentinel.prev_use
+        entry.prev_use = last
+        entry.next_use = self._sentinel
+        last.next_use = entry
+        self._sentinel.prev_use = entry
+
+    @staticmethod
+    def unlink(entry: CacheNode) -> None:
+        """Unlink an entry from whichever list it is in."""
+        entry.prev_use.next_use = entry.next_use
+        entry.next_use.prev_use = entry.prev_use
+        entry.prev_use = entry.next_use = None
+
+    def first(self) -> CacheNode:
+        """Return the least recently used entry, or None if the list is empty."""
+        entry = self._sentinel.next_use
+        return None if entry is self._sentinel else entry
+
+    def is_empty(self) -> bool:
+        """Return True if the list holds no entries."""
+        return self._sentinel.next_use is self._sentinel
+
+    def __iter__(self):
+        """Yield the entries from least to most recently used."""
+        entry = self._sentinel.next_use
+        while entry is not self._sentinel:
+            yield entry
+            entry = entry.next_use
+
+
+class Cache:
+
+    def __init__(self, max_entries: int, function=hash, policy: str = 'lru', max_bytes: int = None,
+                 ttl: float = None, size_function=None) -> None:
+        """
+        Initialize new Cache holding at most max_entries entries. policy is 'lru' or 'lfu'. If max_bytes is given,
+        entries are also evicted while their total size is above it, measuring each value with size_function, which
+        defaults to sys.getsizeof. If ttl is given, entries expire that many seconds after they are put.
+        """
+        self._map = CacheMap(max(max_entries, 1), function)
+        self._max_entries = max(max_entries, 1)
+        self._lfu = policy == 'lfu'
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._size_function = size_function if size_function is not None else sys.getsizeof
+        self._bytes = 0
+
+        # LRU keeps one list; LFU keeps a list per use count and the smallest count that has entries
+        self._recency = EntryList()
+        self._by_uses = {}
+        self._min_uses = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'Cache(' + ', '.join(str(entry.key) + ': ' + str(entry.value)
+                                    for entry in self._iter_entries()) + ')'
+
+    def get_size(self) -> int:
+        """
+        Return the number of cached entries
+        """
+        return self._map.get_size()
+
+    def get_bytes(self) -> int:
+        """
+        Return the total size of the cached values, or 0 if no byte budget is set
+        """
+        return self._bytes
+
+    # ------------------------------------------------------------------ #
+
+    def _link(self, entry: CacheNode) -> None:
+        """
+        Takes an entry as a parameter and links it at the most recently used end of its usage list. Returns None.
+        """
+        if not self._lfu:
+            self._recency.append(entry)
+            return
+        entries = self._by_uses.get(entry.uses)
+        if entries is None:
+            entries = self._by_uses[entry.uses] = EntryList()
+        entries.append(entry)
+
+    def _unlink(self, entry: CacheNode) -> None:
+        """
+        Takes an entry as a parameter and unlinks it from its usage list, dropping an emptied LFU list. Returns None.
+        """
+        EntryList.unlink(entry)
+        if self._lfu and self._by_uses[entry.uses].is_empty():
+            del self._by_uses[entry.uses]
+
+    def _touch(self, entry: CacheNode) -> None:
+        """
+        Takes an entry that has just been used as a parameter. Moves it to the most recently used end of the recency
+        list, or for LFU to the list for one more use. Returns None.
+        """
+        self._unlink(entry)
+        if self._lfu:
+            if entry.uses == self._min_uses and entry.uses not in self._by_uses:
+                self._min_uses += 1
+            entry.uses += 1
+        self._link(entry)
+
+    def _drop(self, entry: CacheNode) -> None:
+        """
+        Takes an entry as a parameter and removes it from its usage list and the hash map. Returns None.
+        """
+        self._unlink(entry)
+        self._map.remove(entry.key)
+        self._bytes -= entry.size
+
+    def _victim(self) -> CacheNode:
+        """
+        Takes no parameters. Returns the entry to evict next: the least recently used one, or for LFU the least
+        recently used of the least frequently used ones. Returns None if there are no entries.
+        """
+        if not self._lfu:
+            return self._recency.first()
+        if not self._by_uses:
+            return None
+        if self._min_uses not in self._by_uses:
+            self._min_uses = min(self._by_uses)
+        return self._by_uses[self._min_uses].first()
+
+    def _over_budget(self) -> bool:
+        """
+        Takes no parameters. Returns True if the cache holds more entries or bytes than allowed, otherwise False.
+        """
+        if self._map.get_size() > self._max_entries:
+            return True
+        return self._max_bytes is not None and self._bytes > self._max_bytes
+
+    def _evict(self, keep: CacheNode) -> None:
+        """
+        Takes the entry that was just put as a parameter. Evicts entries until the cache is within its entry and byte
+        budgets. The given entry is unlinked meanwhile so it is never chosen, even when it is the only entry with the
+        fewest uses. Returns None.
+        """
+        if not self._over_budget():
+            return
+        self._unlink(keep)
+        while self._over_budget():
+            victim = self._victim()
+            if victim is None:
+                break
+            self._drop(victim)
+            self._evictions += 1
+        self._link(keep)
+        if self._lfu:
+            self._min_uses = min(self._min_uses, keep.uses)
+
+    def _expired(self, entry: CacheNode) -> bool:
+        """
+        Takes an entry as a parameter. Removes it and counts an expiry if its time to live has passed. Returns True if
+        it expired, otherwise returns False.
+        """
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            self._drop(entry)
+            self._expirations += 1
+            return True
+        return False
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        Takes a key and an optional default value as parameters. Returns the cached value and marks it as used, or
+        returns the default if the key is not cached or has expired. Counts a hit or a miss.
+        """
+        entry = self._map.get_node(key)
+        if entry is None or self._expired(entry):
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._touch(entry)
+        return entry.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key as a parameter. Returns True if it is cached and has not expired, otherwise returns False. Does not
+        count as a use, a hit or a miss.
+        """
+        entry = self._map.get_node(key)
+        return entry is not None and not self._expired(entry)
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Takes a key, a value and an optional time to live in seconds, which overrides the cache's own, as parameters.
+        Caches the value with a single probe of the hash map, replacing any cached value for the key, then evicts
+        entries until the cache is within its budgets. Returns None.
+        """
+        entry, inserted = self._map.upsert(key, value)
+        if inserted:
+
+            # The map may have reused a node released by an earlier removal, so start its usage fields afresh
+            entry.uses = 1
+            entry.size = 0
+            entry.expires = None
+            self._link(entry)
+            self._min_uses = 1
+        else:
+            self._touch(entry)
+
+        # Record the size and expiry time of the new value
+        if self._max_bytes is not None:
+            size = self._size_function(value)
+            self._bytes += size - entry.size
+            entry.size = size
+        ttl = ttl if ttl is not None else self._ttl
+        entry.expires = time.monotonic() + ttl if ttl is not None else None
+        self._evict(entry)
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key as a parameter and removes it from the cache if it is there. Returns None.
+        """
+        entry = self._map.get_node(key)
+        if entry is not None:
+            self._drop(entry)
+
+    def purge_expired(self) -> int:
+        """
+        Takes no parameters. Removes every expired entry, which get otherwise only does for the keys it looks up.
+        Returns the number of entries removed.
+        """
+        now = time.monotonic()
+        expired = [entry for entry in self._iter_entries() if entry.expires is not None and entry.expires <= now]
+        for entry in expired:
+            self._drop(entry)
+        self._expirations += len(expired)
+        return len(expired)
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Removes every entry, keeping the counters. Returns None
+        """
+        self._map.clear()
+        self._recency = EntryList()
+        self._by_uses = {}
+        self._min_uses = 0
+        self._bytes = 0
+
+    def _iter_entries(self):
+        """
+        Takes no parameters. Generator that yields every entry in eviction order.
+        """
+        if not self._lfu:
+            yield from self._recency
+            return
+        for uses in sorted(self._by_uses):
+            yield from self._by_uses[uses]
+
+    def _iter_keys(self):
+        """
+        Takes no parameters. Generator that yields every key in eviction order.
+        """
+        for entry in self._iter_entries():
+            yield entry.key
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the cached keys, the next one to be evicted
+        first. Returns the DA.
+        """
+        return DynamicArray(list(self._iter_keys()))
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters. Returns a dictionary of the hit, miss, eviction and expiry counts and the hit rate.
+        """
+        lookups = self._hits + self._misses
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'expirations': self._expirations, 'hit_rate': self._hits / lookups if lookups else 0.0}
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nLRU example")
+    print("-----------")
+    c = Cache(3, hash_function_2)
+    for key in ['a', 'b', 'c']:
+        c.put(key, key.upper())
+    c.get('a')
+    c.put('d', 'D')
+    print(c, c.get('b'), c.get_keys())
+    print(c.stats())
+
+    print("\nLFU example")
+    print("-----------")
+    c = Cache(3, hash_function_2, 'lfu')
+    for key in ['a', 'b', 'c', 'a', 'a', 'b']:
+        if c.get(key) is None:
+            c.put(key, key.upper())
+    c.put('d', 'D')
+    print(c, c.get_keys(), c.stats())
+
+    print("\nmax_bytes / ttl example")
+    print("-----------------------")
+    c = Cache(100, hash, max_bytes=300, ttl=0.05, size_function=len)
+    for i in range(5):
+        c.put(i, 'x' * 100)
+    print(c.get_size(), c.get_bytes(), c.get_keys())
+    time.sleep(0.06)
+    print(c.get(4), c.purge_expired(), c.get_size(), c.stats())
@@ -0,0 +1,299 @@
+# Description: This script contains a thread-safe HashMap class that splits its keys across a number of stripes. Each
+# stripe is an ordinary separate chaining HashMap guarded by its own lock, and the stripe of a key is chosen from the
+# mixed bits of Python's built-in hash, so the user hash function only runs once, inside the stripe. Threads working
+# on keys in different stripes never wait for each other, and each stripe grows or shrinks on its own under its lock.
+# Operations that cover the whole map take every stripe lock in order.
+
+
+import threading
+from contextlib import contextmanager
+
+from hash_map_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_support import mix_hash, next_power_of_two
+from hash_map_sc import HashMap as ChainingHashMap
+
+
+class HashMap:
+
+    def __init__(self, capacity: int, function, stripes: int = 16, map_class=ChainingHashMap) -> None:
+        """
+        Initialize new concurrent HashMap. The number of stripes is rounded up to a power of two and the capacity is
+        split evenly between them. Each stripe is an instance of map_class using the given hash function.
+        """
+        stripes = next_power_of_two(stripes)
+        stripe_capacity = max(capacity // stripes, 1)
+        self._stripes = [map_class(stripe_capacity, function) for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._mask = stripes - 1
+        self._hash_function = function
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        with self._lock_all():
+            for i in range(len(self._stripes)):
+                out += 'Stripe ' + str(i) + ':\n' + str(self._stripes[i])
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map. Stripes are read one at a time, so the result may be out of date if other threads are
+        writing.
+        """
+        return sum(stripe.get_size() for stripe in self._stripes)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, which is the total capacity of the stripes
+        """
+        return sum(stripe.get_capacity() for stripe in self._stripes)
+
+    # ------------------------------------------------------------------ #
+
+    def _stripe_index(self, key: str) -> int:
+        """
+        Takes a key as a parameter. Returns the index of the stripe that owns it, chosen from the high bits of the mixed
+        built-in hash. The user hash function is left for the stripe to run, so each key is only hashed once by it.
+        """
+        return (mix_hash(hash(key)) >> 32) & self._mask
+
+    @contextmanager
+    def _lock_all(self):
+        """
+        Takes no parameters. Context manager that holds every stripe lock, always acquired in stripe order so two
+        threads covering the whole map cannot deadlock.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the stripe that owns the key while holding its lock. Returns None.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            self._stripes[index].put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. Returns None.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            self._stripes[index].remove(key)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Takes a key and an optional default value as parameters. Returns the value associated with the key, first
+        putting the default into the hash map if the key does not exist. The check and insert are atomic.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].setdefault(key, default)
+
+    def get_or_put(self, key: str, factory) -> object:
+        """
+        Takes a key and a function taking no arguments as parameters. Returns the value associated with the key,
+        putting the result of the function into the hash map first if the key does not exist. The function is called
+        at most once per key while the stripe lock is held, so it must not use this hash map.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].get_or_put(key, factory)
+
+    def update(self, key: str, function, default: object = None) -> object:
+        """
+        Takes a key, a function taking one argument and an optional default value as parameters. Atomically replaces
+        the value associated with the key by the result of calling the function on it, starting from the default if
+        the key does not exist. The function must not use this hash map. Returns the new value.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].update(key, function, default)
+
+    def increment(self, key: str, amount=1):
+        """
+        Takes a key and an optional amount as parameters. Atomically adds the amount to the value associated with the
+        key, starting from 0 if the key does not exist. Returns the new value.
+        """
+        index = self._stripe_index(key)
+        with self._locks[index]:
+            return self._stripes[index].increment(key, amount)
+
+    def _group(self, keys) -> (list, list):
+        """
+        Takes an iterable of keys as a parameter. Returns a list with one list per stripe holding the positions of its
+        keys in the input, together with the keys as a list.
+        """
+        keys = list(keys)
+        groups = [[] for _ in self._stripes]
+        for num in range(len(keys)):
+            groups[self._stripe_index(keys[num])].append(num)
+        return groups, keys
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Puts the pairs stripe by stripe, holding each lock once
+        for all of its keys. The batch as a whole is not atomic. Returns None.
+        """
+        if values is None:
+            pairs = list(keys)
+            keys = [pair[0] for pair in pairs]
+            values = [pair[1] for pair in pairs]
+        else:
+            values = list(values)
+        groups, keys = self._group(keys)
+
+        for index in range(len(groups)):
+            positions = groups[index]
+            if positions:
+                with self._locks[index]:
+                    self._stripes[index].put_many([keys[num] for num in positions], [values[num] for num in positions])
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Looks the keys up stripe by stripe, holding each lock once for all
+        of its keys. Returns a list of the values in the same order as the keys, with None for missing keys.
+        """
+        groups, keys = self._group(keys)
+        results = [None] * len(keys)
+        for index in range(len(groups)):
+            positions = groups[index]
+            if positions:
+                with self._locks[index]:
+                    found = self._stripes[index].get_many([keys[num] for num in positions])
+                for num in range(len(positions)):
+                    results[positions[num]] = found[num]
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and removes them stripe by stripe, holding each lock once for all of
+        its keys. Missing keys are ignored. Returns None.
+        """
+        groups, keys = self._group(keys)
+        for index in range(len(groups)):
+            positions = groups[index]
+            if positions:
+                with self._locks[index]:
+                    self._stripes[index].remove_many([keys[num] for num in positions])
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        with self._lock_all():
+            return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        with self._lock_all():
+            return sum(stripe.empty_buckets() for stripe in self._stripes)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Holds every stripe lock and resizes
+        each stripe to an even share of the new capacity, so no thread sees a partly resized map. Stripes also resize
+        themselves as they fill, which only needs their own lock. Returns None.
+        """
+        if new_capacity < 1:
+            return
+        with self._lock_all():
+            stripe_capacity = max(new_capacity // len(self._stripes), 1)
+            for stripe in self._stripes:
+                stripe.resize_table(stripe_capacity)
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values while holding every stripe lock. Returns None
+        """
+        with self._lock_all():
+            for stripe in self._stripes:
+                stripe.clear()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table at one point in time,
+        holding every stripe lock while collecting them. Returns the DA.
+        """
+        keys = DynamicArray()
+        with self._lock_all():
+            for stripe in self._stripes:
+                stripe_keys = stripe.get_keys()
+                for num in range(stripe_keys.length()):
+                    keys.append(stripe_keys[num])
+        return keys
+
+    def items(self) -> list:
+        """
+        Takes no parameters. Returns a list of every key,value pair in the hash map as tuples, taken at one point in
+        time while holding every stripe lock. A list is returned rather than a lazy generator so that other threads
+        can keep writing while the caller works through it.
+        """
+        with self._lock_all():
+            return [pair for stripe in self._stripes for pair in stripe.items()]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(64, hash_function_2, 4)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nthreaded increment example")
+    print("--------------------------")
+    m = HashMap(16, hash)
+
+    def worker() -> None:
+        for i in range(1000):
+            m.increment(i % 10)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get_many(range(10)), m.get_size())
+
+    print("\nresize / get_keys example")
+    print("-------------------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(20):
+        m.put(i, i * 10)
+    m.resize_table(100)
+    print(m.get_keys(), m.get_size(), m.get_capacity())
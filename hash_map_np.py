@@ -0,0 +1,424 @@
+# Description: This script contains a HashMap class that creates an open addressing hash table ADT for integer or
+# fixed-width byte string keys, stored in NumPy arrays. It offers the same methods as the open addressing HashMap,
+# but its batch methods hash, probe and insert whole arrays of keys at once with vectorized operations. Only the few
+# keys left after several rounds of collisions are finished with ordinary scalar probing. Capacities are powers of
+# two and collisions are handled with triangular probing. Requires NumPy.
+
+
+import numpy as np
+
+from hash_map_include import DynamicArray
+from hash_map_support import next_power_of_two
+
+
+# Slot states stored in the state array
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+# Once fewer keys than this are still probing, the rest are finished with scalar code
+_VECTOR_MIN = 32
+
+_MURMUR_C1 = np.uint64(0xFF51AFD7ED558CCD)
+_MURMUR_C2 = np.uint64(0xC4CEB9FE1A85EC53)
+_SHIFT = np.uint64(33)
+
+
+def _fmix64(hashes: np.ndarray) -> np.ndarray:
+    """Apply the MurmurHash3 64-bit finalizer to every element of a uint64 array."""
+    hashes = hashes ^ (hashes >> _SHIFT)
+    hashes = hashes * _MURMUR_C1
+    hashes = hashes ^ (hashes >> _SHIFT)
+    hashes = hashes * _MURMUR_C2
+    return hashes ^ (hashes >> _SHIFT)
+
+
+def hash_array(keys: np.ndarray) -> np.ndarray:
+    """
+    Vectorized hash function for arrays of integer keys or fixed-width byte string keys. Integers are mixed
+    directly; byte strings are zero padded to a multiple of 8 bytes and mixed one 64-bit word at a time.
+    Returns an array of uint64 hash codes.
+    """
+    if keys.dtype.kind in 'iu':
+        return _fmix64(keys.astype(np.uint64))
+
+    if keys.dtype.kind == 'S':
+        width = keys.dtype.itemsize
+        padded = np.zeros((keys.shape[0], -(-width // 8) * 8), dtype=np.uint8)
+        padded[:, :width] = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(keys.shape[0], width)
+        words = padded.view('<u8')
+        hashes = np.zeros(keys.shape[0], dtype=np.uint64)
+        for column in range(words.shape[1]):
+            hashes = _fmix64(hashes ^ words[:, column])
+        return hashes
+
+    raise TypeError('hash_array only supports integer and fixed-width bytes keys')
+
+
+class HashMap:
+
+    # The table is rehashed in place once tombstones make up more than this fraction of it
+    _max_tombstone_load = 0.25
+
+    def __init__(self, capacity: int, function=hash_array, key_dtype=np.int64, value_dtype=object) -> None:
+        """
+        Initialize new HashMap that stores its keys, values, hashes and slot states in NumPy arrays. The hash
+        function takes an array of keys and returns an array of uint64 hash codes. Keys are stored with key_dtype,
+        which must be an integer or fixed-width bytes dtype, and values with value_dtype. The capacity is rounded
+        up to a power of two.
+        """
+        capacity = next_power_of_two(capacity)
+        self._key_dtype = np.dtype(key_dtype)
+        self._value_dtype = np.dtype(value_dtype)
+        self._allocate(capacity)
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == _TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Takes an integer as a parameter and installs empty key, value, hash and state arrays of that capacity.
+        Returns None.
+        """
+        self._keys = np.zeros(capacity, dtype=self._key_dtype)
+        self._values = np.empty(capacity, dtype=self._value_dtype)
+        self._hashes = np.zeros(capacity, dtype=np.uint64)
+        self._states = np.zeros(capacity, dtype=np.uint8)
+
+    def _as_keys(self, keys) -> np.ndarray:
+        """
+        Takes an iterable of keys and returns them as a one dimensional array of the key dtype. Raises ValueError if a
+        key does not fit the key dtype.
+        """
+        if not isinstance(keys, np.ndarray):
+            keys = list(keys)
+        keys = np.asarray(keys).reshape(-1)
+        if keys.dtype == self._key_dtype:
+            return keys
+
+        # NumPy silently cuts strings longer than the dtype width and truncates or wraps numbers that do not fit,
+        # which would merge different keys, so a key the cast would change is rejected
+        key_dtype = self._key_dtype
+        if key_dtype.kind in 'SU' and keys.dtype.kind in 'SU':
+            width = key_dtype.itemsize if key_dtype.kind == 'S' else key_dtype.itemsize // 4
+            if keys.size and np.char.str_len(keys).max() > width:
+                raise ValueError('Key longer than the key dtype ' + str(key_dtype))
+            return keys.astype(key_dtype)
+        cast = keys.astype(key_dtype)
+        if not np.array_equal(cast, keys):
+            raise ValueError('Key does not fit the key dtype ' + str(key_dtype))
+        return cast
+
+    def _as_values(self, values, count: int) -> np.ndarray:
+        """
+        Takes an iterable of values and the number of keys they belong to. Returns the values as an array of the
+        value dtype, without letting NumPy unpack values that are themselves sequences.
+        """
+        if isinstance(values, np.ndarray) and values.dtype == self._value_dtype:
+            return values.reshape(-1)
+        return np.fromiter(values, dtype=self._value_dtype, count=count)
+
+    def _find(self, keys: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """
+        Takes arrays of keys and their hashes. Probes all keys in lockstep, one probe step per round, until fewer
+        than _VECTOR_MIN are unresolved, then finishes the rest with scalar probing. Returns an array holding the
+        slot of each key, or -1 for keys that are not in the table. No key is probed more than capacity times, which
+        visits every slot, so a lookup ends even if the table has no empty slot.
+        """
+        capacity = self._capacity
+        mask = capacity - 1
+        states, table_keys, table_hashes = self._states, self._keys, self._hashes
+        found = np.full(keys.shape[0], -1, dtype=np.int64)
+        homes = (hashes & np.uint64(mask)).astype(np.int64)
+
+        # Vectorized rounds: resolve hits, drop keys that reached an empty slot, advance the rest
+        active = np.arange(keys.shape[0])
+        step = 0
+        while active.shape[0] >= _VECTOR_MIN and step < capacity:
+            slots = (homes[active] + step * (step + 1) // 2) & mask
+            slot_states = states[slots]
+            hit = ((slot_states == _LIVE) & (table_hashes[slots] == hashes[active])
+                   & (table_keys[slots] == keys[active]))
+            found[active[hit]] = slots[hit]
+            active = active[(slot_states != _EMPTY) & ~hit]
+            step += 1
+
+        # Scalar tail for the few keys still colliding
+        for num in active.tolist():
+            key, hash, home = keys[num], hashes[num], int(homes[num])
+            for probe in range(step, capacity):
+                slot = (home + probe * (probe + 1) // 2) & mask
+                if states[slot] == _EMPTY:
+                    break
+                if states[slot] == _LIVE and table_hashes[slot] == hash and table_keys[slot] == key:
+                    found[num] = slot
+                    break
+        return found
+
+    def _insert_absent(self, keys: np.ndarray, hashes: np.ndarray, values: np.ndarray) -> None:
+        """
+        Takes arrays of distinct keys known to be absent from the table, with their hashes and values. Inserts them
+        in vectorized rounds: each key claims the first non-live slot of its probe sequence, one key wins each
+        contested slot, and the rest move on to their next probe. Every key probes at most capacity slots, which
+        visits the whole table; the caller keeps the load at or below .5, so a free slot is always found, and
+        RuntimeError is raised rather than looping forever if it is not. Returns None.
+        """
+        capacity = self._capacity
+        mask = capacity - 1
+        states = self._states
+        homes = (hashes & np.uint64(mask)).astype(np.int64)
+        steps = np.zeros(keys.shape[0], dtype=np.int64)
+
+        active = np.arange(keys.shape[0])
+        rounds = 0
+        while active.shape[0] >= _VECTOR_MIN and rounds < capacity:
+            rounds += 1
+            slots = (homes[active] + steps[active] * (steps[active] + 1) // 2) & mask
+            free = states[slots] != _LIVE
+            slots, claimants = slots[free], active[free]
+
+            # Keep one claimant per slot and write the winners in one go
+            slots, first = np.unique(slots, return_index=True)
+            winners = claimants[first]
+            self._tombstones -= int(np.count_nonzero(states[slots] == _TOMBSTONE))
+            self._keys[slots] = keys[winners]
+            self._values[slots] = values[winners]
+            self._hashes[slots] = hashes[winners]
+            states[slots] = _LIVE
+
+            # Everyone else advances to their next probe
+            placed = np.zeros(keys.shape[0], dtype=bool)
+            placed[winners] = True
+            active = active[~placed[active]]
+            steps[active] += 1
+
+        # Scalar tail for the few keys still colliding
+        for num in active.tolist():
+            home = int(homes[num])
+            for probe in range(int(steps[num]), capacity):
+                slot = (home + probe * (probe + 1) // 2) & mask
+                if states[slot] != _LIVE:
+                    if states[slot] == _TOMBSTONE:
+                        self._tombstones -= 1
+                    self._keys[slot] = keys[num]
+                    self._values[slot] = values[num]
+                    self._hashes[slot] = hashes[num]
+                    states[slot] = _LIVE
+                    break
+            else:
+                raise RuntimeError('HashMap table is full')
+
+        self._size += keys.shape[0]
+
+    def put_many(self, keys, values) -> None:
+        """
+        Takes an iterable of keys and an iterable of values of the same length as parameters. Updates keys that
+        already exist, grows the table once for the rest and inserts them in vectorized rounds. If a key appears more
+        than once, its last value wins. Returns None.
+        """
+        keys = self._as_keys(keys)
+        values = self._as_values(values, keys.shape[0])
+
+        # Keep only the last occurrence of each key in the batch
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = keys.shape[0] - 1 - last
+        keys, values = keys[last], values[last]
+        hashes = self._hash_function(keys)
+
+        # Update the keys that are already present
+        slots = self._find(keys, hashes)
+        present = slots >= 0
+        self._values[slots[present]] = values[present]
+
+        # Grow the table once so the load stays at or below .5, then insert the new keys
+        absent = ~present
+        incoming = int(np.count_nonzero(absent))
+        if self._size + incoming > self._capacity * 0.5:
+            self.resize_table(2 * (self._size + incoming))
+        self._insert_absent(keys[absent], hashes[absent], values[absent])
+
+    def get_many(self, keys, default=None) -> np.ndarray:
+        """
+        Takes an iterable of keys and an optional default as parameters. Returns an array holding the value of each
+        key, with the default in place of keys that do not exist. The array has the value dtype unless a None default
+        has to be filled in for a non-object value dtype, in which case it holds objects.
+        """
+        keys = self._as_keys(keys)
+        slots = self._find(keys, self._hash_function(keys))
+        present = slots >= 0
+        if present.all():
+            return self._values[slots]
+
+        dtype = self._value_dtype
+        if default is None and dtype != object and not present.all():
+            dtype = np.dtype(object)
+        results = np.full(keys.shape[0], default, dtype=dtype)
+        results[present] = self._values[slots[present]]
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and turns each key,value pair that exists into a tombstone. The table
+        is compacted at most once, after the whole batch. Returns None.
+        """
+        keys = self._as_keys(keys)
+        slots = self._find(keys, self._hash_function(keys))
+        slots = np.unique(slots[slots >= 0])
+
+        self._states[slots] = _TOMBSTONE
+        if self._value_dtype == object:
+            self._values[slots] = None
+        self._size -= slots.shape[0]
+        self._tombstones += slots.shape[0]
+
+        # Compact once if the batch left too many tombstones behind
+        if self._tombstones > self._capacity * self._max_tombstone_load:
+            self.compact()
+
+    def put(self, key, value: object) -> None:
+        """
+        Takes two parameters - a key and an object representing a value. Put the key,value pair into the HashTable,
+        resizing if necessary. Returns None.
+        """
+        self.put_many([key], [value])
+
+    def get(self, key) -> object:
+        """
+        Takes a key as a parameter and attempts to find the value associated with it. Returns the value if found,
+        otherwise returns None.
+        """
+        keys = self._as_keys([key])
+        slot = int(self._find(keys, self._hash_function(keys))[0])
+        if slot == -1:
+            return None
+        value = self._values[slot]
+        return value if self._value_dtype == object else value.item()
+
+    def contains_key(self, key) -> bool:
+        """
+        Takes a key as a parameter and attempts to find it in the table. Returns True if found, otherwise returns
+        False.
+        """
+        keys = self._as_keys([key])
+        return int(self._find(keys, self._hash_function(keys))[0]) != -1
+
+    def remove(self, key) -> None:
+        """
+        Takes a key as a parameter and attempts to remove it from the table. If found, mark the slot as a tombstone,
+        otherwise does nothing. Returns None.
+        """
+        self.remove_many([key])
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Resizes the table to that capacity
+        rounded up to a power of two, and to at least twice the size so the load stays at or below the .5 that put
+        keeps, and reinserts all live entries in vectorized rounds using their cached hashes. Returns None.
+        """
+
+        # Check if the new capacity is valid and round it up to a power of two that keeps the load at or below .5
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        new_capacity = next_power_of_two(max(new_capacity, 2 * self._size))
+
+        # Take the live entries out of the old arrays and insert them into new ones
+        live = self._states == _LIVE
+        keys, values, hashes = self._keys[live], self._values[live], self._hashes[live]
+        self._allocate(new_capacity)
+        self._capacity = new_capacity
+        self._size = 0
+        self._tombstones = 0
+        self._insert_absent(keys, hashes, values)
+
+    def compact(self) -> None:
+        """
+        Takes no parameters. Rehashes the table in place at the same capacity, dropping every tombstone. Returns None.
+        """
+        self.resize_table(self._capacity)
+
+    def get_tombstone_count(self) -> int:
+        """
+        Takes no parameters. Returns the number of tombstones in the table.
+        """
+        return self._tombstones
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values. Returns None
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table. Returns the DA.
+        """
+        return DynamicArray(self._keys[self._states == _LIVE].tolist())
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput_many / get_many example")
+    print("---------------------------")
+    m = HashMap(16, value_dtype=np.int64)
+    ids = np.arange(0, 100000, 3)
+    m.put_many(ids, ids * 10)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    print(m.get_many([0, 1, 3, 99999], default=-1))
+
+    print("\nremove_many example")
+    print("-------------------")
+    m.remove_many(ids[:10000])
+    print(m.get_size(), m.get_tombstone_count(), m.get(0), m.get(30000), m.contains_key(30000))
+
+    print("\nbytes keys example")
+    print("------------------")
+    m = HashMap(8, key_dtype='S12')
+    m.put(b'apple', 1)
+    m.put(b'grape', 2)
+    m.put(b'apple', 3)
+    print(m.get(b'apple'), m.get(b'melon'), m.get_keys())
@@ -1,21 +1,63 @@
 # Name: Taylor Garrison
 # Description: This script contains a HashMap class that creates a hash table ADT, using a Dynamic Array to store its
 # data as HashEntry objects. Collisions are handled by open addressing so that values with the same indices are moved
-# to an empty index using quadratic probing. Removed values are considered tombstones, and are removed when the HashMap
-# is resized or when a new value is placed in their spot.
+# to an empty index using triangular probing. Capacities are powers of two, so indices are taken with a bitmask of the
+# mixed hash and the probe sequence is guaranteed to visit every index. Removed values are considered tombstones, and
+# are removed when the HashMap is resized, when a new value is placed in their spot, or when enough of them build up
+# that the table is compacted.
 
 
-from hash_map_include import (DynamicArray, HashEntry,
-                        hash_function_1, hash_function_2)
+from hash_map_include import DynamicArray, HashEntry, hash_function_1, hash_function_2
+from hash_map_support import FreeList, mix_hash, next_power_of_two
 
 
 class HashMap:
+
+    # Incremental resizing is disabled by default. When enabled, the old table is kept alongside the new one and
+    # each put, get and remove migrates a bounded number of old buckets until the old table is empty.
+    _migrate_step = 0
+    _old_buckets = None
+    _old_capacity = 0
+    _migrate_index = 0
+
+    # While incremental resizing is on, the table for the next growth is allocated _alloc_chunk buckets per insert
+    # instead of all at once, and the migration begins when it is complete
+    _growing_da = None
+    _growing_da_capacity = 0
+    _alloc_chunk = 1024
+
+    # Counts structural changes (inserts, removals, clears and resizes) so lazy iterators can detect them
+    _mod_count = 0
+
+    # Tombstones in the current table are counted separately from live entries. Once they make up more than
+    # _max_tombstone_load of the capacity, the table is rehashed in place at the same capacity to clear them out.
+    _tombstones = 0
+    _max_tombstone_load = 0.25
+
+    # Live entries and tombstones together are never allowed to fill more than this fraction of the table, so every
+    # probe for a missing key stays short
+    _MAX_OCCUPANCY = 0.75
+
+    # A probe sequence longer than _max_probe is far beyond what a random hash produces at a load of at most .5, so it
+    # is treated as a flood of colliding keys. If the hash function can be reseeded (see hash_functions.SeededHash),
+    # the map switches to a freshly seeded copy and rehashes, at most once each time the size doubles.
+    _max_probe = 64
+    _reseed_size = 0
+
+    # A pair put where a tombstone was reuses the tombstone's entry. Tombstones dropped by a rehash and entries dropped
+    # by clear are kept on a free list of up to _free_limit entries, created on first use, for later inserts to reuse
+    _free_entries = None
+    _free_limit = 1024
+
     def __init__(self, capacity: int, function) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
+        triangular probing for collision resolution
         DO NOT CHANGE THIS METHOD IN ANY WAY
+        The one exception is the first line, which rounds the capacity up to a power of two
+        because every index is taken with a bitmask of the hash (see the module description)
         """
+        capacity = next_power_of_two(capacity)
         self._buckets = DynamicArray()
         for _ in range(capacity):
             self._buckets.append(None)
@@ -55,35 +97,185 @@ class HashMap:
         Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
         into the HashTable, resizing if necessary. Returns None.
         """
+        self._put_hashed(key, value, mix_hash(self._hash_function(key)))
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Takes a key, a value and the full mixed hash of the key as parameters. Puts the key,value pair into the
+        HashTable without invoking the hash function, resizing if necessary. Returns None.
+        """
 
         # Check the table load and double capacity if >= .5
         if self.table_load() >= 0.5:
-            self.resize_table(self._capacity * 2)
+            self._grow()
+
+        # During an incremental resize, migrate a few buckets and update the key in place if it is still in the old
+        # table
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            entry = self._find_old(key, hash)
+            if entry is not None:
+                entry.value = value
+                return
 
         # Calculate the index
-        index = self._hash_function(key) % self._capacity
+        mask = self._capacity - 1
+        initial_index = hash & mask
 
-        # If there is nothing or a tombstone at the index, add the pair and increase size
-        if self._buckets[index] is None or self._buckets[index].is_tombstone:
-            self._buckets[index] = HashEntry(key, value)
-            self._size += 1
+        # Use triangular probing until an empty index, updating the value if the key exists. The first tombstone
+        # passed is remembered, but can only be reused once the rest of the probe shows the key is absent.
+        free_index = -1
+        for num in range(self._capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            entry = self._buckets[index]
+            if entry is None:
+                break
+            if entry.is_tombstone:
+                if free_index == -1:
+                    free_index = index
+            elif entry.hash == hash and entry.key == key:
+                entry.value = value
+                return
+
+        # Add the pair at the first tombstone passed, or else at the empty index, and increase size
+        if free_index != -1:
+            index = free_index
+            self._tombstones -= 1
+        self._buckets[index] = self._new_entry(key, value, hash, self._buckets[index])
+        self._size += 1
+        self._mod_count += 1
+        if num > self._max_probe:
+            self._reseed_if_flooded()
+
+    def _find_or_insert(self, key: str, value: object) -> (HashEntry, bool):
+        """
+        Takes a key and a value as parameters. Finds the HashEntry holding the key, or adds a new one with the given
+        value if the key does not exist, resizing first if necessary. Returns the entry and whether it was added.
+        """
+        hash = mix_hash(self._hash_function(key))
+        entry, index, probe_length = self._probe(key, hash)
+        if entry is not None:
+            return entry, False
+        return self._add_entry(key, value, hash, index, probe_length), True
 
-        # If the key exists, update the value
-        elif self._buckets[index].key == key:
-            self._buckets[index].value = value
+    def _probe(self, key: str, hash: int) -> (HashEntry, int, int):
+        """
+        Takes a key and its full mixed hash as parameters. Grows the table if the load is .5 or more and migrates a few
+        buckets during an incremental resize, then searches the old table and probes the current one. Returns the live
+        HashEntry holding the key or None, the index a new entry for the key would go in and the probe length.
+        """
 
-        # Use quadratic probing to find an empty, tombstone, or matching key index and add the pair
-        else:
-            initial_index = index
-            for num in range(1, self._capacity):
-                index = (initial_index + num ** 2) % self._capacity
-                if self._buckets[index] is None or self._buckets[index].is_tombstone:
-                    self._buckets[index] = HashEntry(key, value)
-                    self._size += 1
-                    return
-                elif self._buckets[index].key == key:
-                    self._buckets[index] = HashEntry(key, value)
-                    return
+        # Check the table load and double capacity if >= .5
+        if self.table_load() >= 0.5:
+            self._grow()
+
+        # During an incremental resize, migrate a few buckets and check the old table first
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            entry = self._find_old(key, hash)
+            if entry is not None:
+                return entry, -1, 0
+
+        # Use triangular probing until an empty index, remembering the first tombstone passed
+        mask = self._capacity - 1
+        initial_index = hash & mask
+        free_index = -1
+        for num in range(self._capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            entry = self._buckets[index]
+            if entry is None:
+                break
+            if entry.is_tombstone:
+                if free_index == -1:
+                    free_index = index
+            elif entry.hash == hash and entry.key == key:
+                return entry, index, num
+
+        # A new entry goes at the first tombstone passed, or else at the empty index
+        return None, index if free_index == -1 else free_index, num
+
+    def _is_free(self, index: int) -> bool:
+        """
+        Takes an index as a parameter. Returns True if it is empty or holds a tombstone, otherwise returns False.
+        """
+        entry = self._buckets[index]
+        return entry is None or entry.is_tombstone
+
+    def _add_entry(self, key: str, value: object, hash: int, index: int, probe_length: int) -> HashEntry:
+        """
+        Takes a key that _probe did not find, a value, the full mixed hash of the key and the index and probe length
+        _probe returned as parameters. Adds a new entry at that index without probing again. Returns the entry.
+        """
+        entry = self._buckets[index]
+        if entry is not None:
+            self._tombstones -= 1
+        entry = self._new_entry(key, value, hash, entry)
+        self._buckets[index] = entry
+        self._size += 1
+        self._mod_count += 1
+        if probe_length > self._max_probe:
+            self._reseed_if_flooded()
+        return entry
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Takes a key and an optional default value as parameters. Returns the value associated with the key, first
+        putting the default into the hash map if the key does not exist. The key is hashed and probed once.
+        """
+        return self._find_or_insert(key, default)[0].value
+
+    def get_or_put(self, key: str, factory) -> object:
+        """
+        Takes a key and a function taking no arguments as parameters. Returns the value associated with the key. If
+        the key does not exist, the function is called and its result is put into the hash map and returned. The key
+        is hashed and probed once, and nothing is put if the function raises an exception.
+        """
+        hash = mix_hash(self._hash_function(key))
+        entry, index, probe_length = self._probe(key, hash)
+        if entry is not None:
+            return entry.value
+        mod_count = self._mod_count
+        value = factory()
+
+        # The factory may have changed the map, even reseeding its hash function, so only then is the key probed
+        # again. A get made by the factory can migrate an entry into the free index without counting as a change.
+        if self._mod_count != mod_count or not self._is_free(index):
+            return self._find_or_insert(key, value)[0].value
+        return self._add_entry(key, value, hash, index, probe_length).value
+
+    def update(self, key: str, function, default: object = None) -> object:
+        """
+        Takes a key, a function taking one argument and an optional default value as parameters. Replaces the value
+        associated with the key by the result of calling the function on it, starting from the default if the key
+        does not exist. The key is hashed and probed once, and nothing is changed if the function raises an exception.
+        Returns the new value.
+        """
+        hash = mix_hash(self._hash_function(key))
+        entry, index, probe_length = self._probe(key, hash)
+        mod_count = self._mod_count
+        value = function(entry.value if entry is not None else default)
+
+        # The function may have removed the key and let its entry be reused for another one, so probe again if the map
+        # changed, and otherwise add the key if it was missing
+        if self._mod_count != mod_count or (entry is None and not self._is_free(index)):
+            entry = self._find_or_insert(key, value)[0]
+        elif entry is None:
+            return self._add_entry(key, value, hash, index, probe_length).value
+        entry.value = value
+        return value
+
+    def increment(self, key: str, amount=1):
+        """
+        Takes a key and an optional amount as parameters. Adds the amount to the value associated with the key,
+        starting from 0 if the key does not exist. The key is hashed and probed once, and nothing is changed if the
+        addition raises an exception. Returns the new value.
+        """
+        hash = mix_hash(self._hash_function(key))
+        entry, index, probe_length = self._probe(key, hash)
+        if entry is not None:
+            entry.value += amount
+            return entry.value
+        return self._add_entry(key, 0 + amount, hash, index, probe_length).value
 
     def table_load(self) -> float:
         """
@@ -96,6 +288,9 @@ class HashMap:
         Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
         """
 
+        # Finish any incremental resize so every entry is in the current table
+        self._finish_migration()
+
         # Set a counter and search for empty or tombstone indices, adding to the counter when found
         counter = 0
         for num in range(self._capacity):
@@ -107,34 +302,241 @@ class HashMap:
 
     def resize_table(self, new_capacity: int) -> None:
         """
-        Takes an integer representing a new capacity for the table as a parameter. Resizes the table and copies over
-        all old values, skipping tombstones. Returns None.
+        Takes an integer representing a new capacity for the table as a parameter. Resizes the table to that capacity
+        rounded up to a power of two and copies over all old values using their cached hashes, skipping tombstones.
+        Returns None.
         """
 
-        # Check if the new capacity is valid
+        # Check if the new capacity is valid and round it up to a power of two
         if new_capacity < 1 or new_capacity < self._size:
             return
+        new_capacity = next_power_of_two(new_capacity)
+
+        # Finish any incremental resize already in progress, then either start a new one or rehash everything now
+        self._finish_migration()
+        if self._migrate_step:
+            self._begin_migration(new_capacity)
+        else:
+            self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing the new capacity as a parameter. Moves every live HashEntry object into a new
+        table using its cached hash and an insert-only probe; keys are already unique and the size does not change,
+        so no duplicate or load checks are made. Returns None.
+        """
 
         # Create and allocate a new DA
         new_da = DynamicArray()
         for _ in range(new_capacity):
             new_da.append(None)
 
-        # Save the capacity, size, and DA of the original table and reassign each variable to the new table
-        old_capacity = self._capacity
+        # Move each live entry into the first empty index of its probe sequence, keeping tombstones for reuse
         old_da = self._buckets
-        old_size = self._size
+        mask = new_capacity - 1
+        for num in range(self._capacity):
+            entry = old_da[num]
+            if entry is None:
+                continue
+            if entry.is_tombstone:
+                self._release_entry(entry)
+                continue
+            initial_index = entry.hash & mask
+            for step in range(new_capacity):
+                index = (initial_index + step * (step + 1) // 2) & mask
+                if new_da[index] is None:
+                    new_da[index] = entry
+                    break
+
+        # Reassign buckets, capacity and the tombstone count
         self._buckets = new_da
         self._capacity = new_capacity
-        self._size = 0
+        self._mod_count += 1
+        self._tombstones = 0
+
+    def _new_entry(self, key: str, value: object, hash: int, entry: HashEntry = None) -> HashEntry:
+        """
+        Takes a key, a value, the full mixed hash of the key and whatever is at the index the pair goes to, which is
+        a tombstone or None, as parameters. Returns an entry holding the pair, reusing the tombstone, or else an entry
+        from the free list if there is one.
+        """
+        if entry is None and self._free_entries is not None:
+            entry = self._free_entries.pop()
+        if entry is None:
+            return HashEntry(key, value, hash)
+        entry.key = key
+        entry.value = value
+        entry.hash = hash
+        entry.is_tombstone = False
+        return entry
+
+    def _release_entry(self, entry: HashEntry) -> bool:
+        """
+        Takes an entry that is no longer in the table as a parameter and puts it on the free list. Returns False if the
+        free list is full, otherwise returns True.
+        """
+        if self._free_entries is None:
+            self._free_entries = FreeList(self._free_limit)
+        return self._free_entries.push(entry)
+
+    def _grow(self) -> None:
+        """
+        Takes no parameters. Doubles the capacity of the table. With incremental resizing on, the new table is built
+        _alloc_chunk buckets at a time by the inserts that keep finding the load too high, and is only installed once it
+        is complete, so no single insert allocates the whole table. Returns None.
+        """
+        new_capacity = self._capacity * 2
+        if not self._migrate_step:
+            self.resize_table(new_capacity)
+            return
+
+        # Start building a new table unless one of the right capacity is already under way, then add the next chunk
+        if self._growing_da is None or self._growing_da_capacity != new_capacity:
+            self._growing_da = DynamicArray()
+            self._growing_da_capacity = new_capacity
+        new_da = self._growing_da
+        for _ in range(min(self._alloc_chunk, new_capacity - new_da.length())):
+            new_da.append(None)
+
+        # Begin migrating into the table once every bucket exists
+        if new_da.length() == new_capacity:
+            self._growing_da = None
+            self._finish_migration()
+            self._begin_migration(new_capacity, new_da)
+
+    def set_incremental_resize(self, step: int) -> None:
+        """
+        Takes an integer representing the number of old buckets to migrate per operation as a parameter. A positive
+        step makes later resizes incremental, so put, get and remove each move at most that many buckets instead of
+        rehashing the whole table at once. A step of 0 finishes any resize in progress and disables the mode.
+        Returns None.
+        """
+        if step < 0:
+            return
+        if step == 0:
+            self._finish_migration()
+        self._migrate_step = step
 
-        # Add old values to the new table, skipping tombstones
+    def _begin_migration(self, new_capacity: int, new_da: DynamicArray = None) -> None:
+        """
+        Takes an integer representing the new capacity and an optional empty table of that capacity as parameters.
+        Installs the table, allocating it if none is given, and keeps the current table as the old table to be
+        migrated incrementally. Returns None.
+        """
+        if new_da is None:
+            new_da = DynamicArray()
+            for _ in range(new_capacity):
+                new_da.append(None)
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+        self._buckets = new_da
+        self._capacity = new_capacity
+        self._mod_count += 1
+        self._tombstones = 0
+
+    def _migrate(self, count: int) -> None:
+        """
+        Takes an integer as a parameter and moves up to that many old buckets into the current table. Migrated
+        buckets are left in the old table so its probe sequences stay intact, but they are never matched again.
+        Returns None.
+        """
+        old_da = self._old_buckets
+        start = self._migrate_index
+        end = min(start + count, self._old_capacity)
+
+        # Move each live entry object into the current table with an insert-only probe
+        for num in range(start, end):
+            entry = old_da[num]
+            if entry is not None and not entry.is_tombstone:
+                self._insert_entry(entry)
+
+        # Drop the old table once every bucket has been migrated
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Takes no parameters. Migrates every remaining old bucket if an incremental resize is in progress. Returns None.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def migration_source(self) -> DynamicArray:
+        """
+        Takes no parameters. Returns the old table an incremental resize is moving entries out of, or None if no resize
+        is in progress. With migrate_step, begin_resize and reset, this lets a caller such as hash_map_async drive a
+        resize or clear in steps.
+        """
+        return self._old_buckets
+
+    def migrate_step(self, count: int) -> None:
+        """
+        Takes an integer as a parameter. Moves up to that many old buckets into the current table if an incremental
+        resize is in progress. Returns None.
+        """
+        if self._old_buckets is not None:
+            self._migrate(count)
+
+    def begin_resize(self, new_da: DynamicArray) -> None:
+        """
+        Takes an empty table as a parameter. Finishes any incremental resize in progress, then starts a new one into the
+        given table, whose length becomes the capacity. A table whose length is not a power of two, or is smaller than
+        the size, is ignored. Returns None.
+        """
+        capacity = new_da.length()
+        if capacity != next_power_of_two(capacity) or capacity < self._size:
+            return
+        self._finish_migration()
+        self._begin_migration(capacity, new_da)
+
+    def reset(self, new_da: DynamicArray) -> list:
+        """
+        Takes an empty table of the current capacity as a parameter. Installs it in place of the current table, emptying
+        the hash map. Returns a list of the tables it replaced, so the caller can release them.
+        """
+        replaced = [self._buckets] if self._old_buckets is None else [self._buckets, self._old_buckets]
+        self._reset(new_da)
+        return replaced
+
+    def _find_old(self, key: str, hash: int) -> HashEntry:
+        """
+        Takes a key and its full mixed hash as parameters. Searches the part of the old table that has not been migrated
+        yet, if any. Returns the live HashEntry holding the key, or None if it is not there.
+        """
+        old_da, old_capacity = self._old_buckets, self._old_capacity
+        if old_da is None:
+            return None
+        mask = old_capacity - 1
+        initial_index = hash & mask
         for num in range(old_capacity):
-            if old_da[num] and not old_da[num].is_tombstone:
-                self.put(old_da[num].key, old_da[num].value)
+            index = (initial_index + num * (num + 1) // 2) & mask
+            entry = old_da[index]
+            if entry is None:
+                return None
+            if (index >= self._migrate_index and not entry.is_tombstone
+                    and entry.hash == hash and entry.key == key):
+                return entry
+        return None
 
-        # Set size to size of old array
-        self._size = old_size
+    def _insert_entry(self, entry: HashEntry) -> None:
+        """
+        Takes a HashEntry whose key is known to be absent from the current table as a parameter. Places it in the
+        first empty or tombstone index of its probe sequence. Returns None.
+        """
+        mask = self._capacity - 1
+        initial_index = entry.hash & mask
+        for num in range(self._capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            if self._buckets[index] is None:
+                self._buckets[index] = entry
+                return
+            if self._buckets[index].is_tombstone:
+                self._buckets[index] = entry
+                self._tombstones -= 1
+                return
 
     def get(self, key: str) -> object:
         """
@@ -142,25 +544,36 @@ class HashMap:
         the value if found, otherwise returns None.
         """
 
-        # Calculate the index
-        index = self._hash_function(key) % self._capacity
+        # Calculate the full mixed hash and the index
+        hash = mix_hash(self._hash_function(key))
+        mask = self._capacity - 1
+        index = hash & mask
+
+        # During an incremental resize, migrate a few buckets and check the old table first
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            entry = self._find_old(key, hash)
+            if entry is not None:
+                return entry.value
 
         # Return None if there is nothing there
         if self._buckets[index] is None:
             return None
 
-        # Return value if the keys match, and it is not a tombstone
-        elif self._buckets[index].key == key and not self._buckets[index].is_tombstone:
+        # Return value if the hashes and keys match, and it is not a tombstone
+        elif (self._buckets[index].hash == hash and self._buckets[index].key == key
+              and not self._buckets[index].is_tombstone):
             return self._buckets[index].value
 
-        # Perform quadratic probing, returning the appropriate value as above
+        # Perform triangular probing, returning the appropriate value as above
         else:
             initial_index = index
             for num in range(1, self._capacity):
-                index = (initial_index + num * num) % self._capacity
+                index = (initial_index + num * (num + 1) // 2) & mask
                 if self._buckets[index] is None:
                     return None
-                elif self._buckets[index].key == key and not self._buckets[index].is_tombstone:
+                elif (self._buckets[index].hash == hash and self._buckets[index].key == key
+                      and not self._buckets[index].is_tombstone):
                     return self._buckets[index].value
             return None
 
@@ -171,61 +584,144 @@ class HashMap:
         """
 
         # Use get to determine if the key exists
-        if self.get(key):
+        if self.get(key) is not None:
             return True
         return False
 
     def remove(self, key: str) -> None:
         """
         Takes a string representing a key as a parameter and attempts to remove it from the table. If found, set the
-        key,value pair to be a tombstone, otherwise does nothing. Returns None.
+        key,value pair to be a tombstone, otherwise does nothing. Compacts the table if there are too many tombstones.
+        Returns None.
         """
 
-        # Calculate the index
-        index = self._hash_function(key) % self._capacity
-
-        # Do nothing if nothing is at index
-        if self._buckets[index] is None:
-            return None
-
-        # If key matches and isn't already a tombstone, set tombstone property to True and decrement size
-        elif self._buckets[index].key == key:
-            if self._buckets[index].is_tombstone:
+        # Calculate the full mixed hash and the index
+        hash = mix_hash(self._hash_function(key))
+        mask = self._capacity - 1
+        index = hash & mask
+
+        # During an incremental resize, migrate a few buckets and remove the key from the old table if it is there
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            entry = self._find_old(key, hash)
+            if entry is not None:
+                entry.is_tombstone = True
+                self._size -= 1
+                self._mod_count += 1
                 return None
-            self._buckets[index].is_tombstone = True
-            self._size -= 1
 
-        # Perform quadratic probing if necessary until index fits one of the above situations and perform appropriate
-        # actions
-        else:
-            initial_index = index
-            for num in range(1, self._capacity):
-                index = (initial_index + num * num) % self._capacity
-                if self._buckets[index] is None:
-                    return None
-                elif self._buckets[index].key == key:
-                    if self._buckets[index].is_tombstone:
-                        return None
-                    self._buckets[index].is_tombstone = True
-                    self._size -= 1
+        # Perform triangular probing until an empty index, skipping tombstones. If the key is found, set its tombstone
+        # property to True, update the counts and compact the table if tombstones have built up
+        initial_index = index
+        for num in range(self._capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            entry = self._buckets[index]
+            if entry is None:
+                return None
+            if not entry.is_tombstone and entry.hash == hash and entry.key == key:
+                entry.is_tombstone = True
+                self._size -= 1
+                self._mod_count += 1
+                self._tombstones += 1
+                if self._tombstones > self._capacity * self._max_tombstone_load:
+                    self.compact()
+                return None
         return None
 
+    def compact(self) -> None:
+        """
+        Takes no parameters. Rehashes the table in place at the same capacity, dropping every tombstone. Returns None.
+        """
+        self._finish_migration()
+        self._rehash(self._capacity)
+
+    def _reseed_if_flooded(self) -> bool:
+        """
+        Takes no parameters. Called when a probe sequence grows longer than _max_probe. If the hash function has a
+        reseeded method and the size has at least doubled since the last reseed, replaces the function with a
+        reseeded copy, recomputes the cached hash of every entry and rehashes the table at the same capacity. Returns
+        True if the map was reseeded, otherwise returns False.
+        """
+        reseeded = getattr(self._hash_function, 'reseeded', None)
+        if reseeded is None or self._size < 2 * self._reseed_size:
+            return False
+
+        # Finish any incremental resize, then give every live entry its mixed hash under the new seed
+        self._finish_migration()
+        self._hash_function = reseeded()
+        hash_function = self._hash_function
+        for num in range(self._capacity):
+            entry = self._buckets[num]
+            if entry is not None and not entry.is_tombstone:
+                entry.hash = mix_hash(hash_function(entry.key))
+        self._rehash(self._capacity)
+        self._reseed_size = self._size
+        return True
+
+    def set_probe_limit(self, length: int) -> None:
+        """
+        Takes a positive integer as a parameter. A probe sequence longer than that is treated as a flood of colliding
+        keys and makes the map reseed its hash function, if the function supports it. Does nothing if the value is
+        not positive. Returns None.
+        """
+        if length < 1:
+            return
+        self._max_probe = length
+
+    def get_tombstone_count(self) -> int:
+        """
+        Takes no parameters. Returns the number of tombstones in the table.
+        """
+        return self._tombstones
+
+    def set_tombstone_threshold(self, fraction: float) -> None:
+        """
+        Takes a float greater than 0 and at most .25 as a parameter. The table is compacted once tombstones take up
+        more than that fraction of its capacity. Live entries fill at most half the table, so the limit of .25 keeps
+        live entries and tombstones together below three quarters of it; past that, a lookup for a missing key can
+        probe a large part of the table before it reaches an empty index. Does nothing if the value is out of range.
+        Returns None.
+        """
+        if fraction <= 0 or fraction > self._MAX_OCCUPANCY - 0.5:
+            return
+        self._max_tombstone_load = fraction
+
     def clear(self) -> None:
         """
         Takes no parameters. Clears the table of any values. Returns None
         """
 
-        # Create new DA, allocate space, set size to 0
-        self._buckets = DynamicArray()
+        # Keep entries for reuse until the free list is full, then drop the rest with the old table
+        for num in range(self._capacity):
+            entry = self._buckets[num]
+            if entry is not None and not self._release_entry(entry):
+                break
+
+        # Create new DA and allocate space
+        new_da = DynamicArray()
         for _ in range(self._capacity):
-            self._buckets.append(None)
+            new_da.append(None)
+        self._reset(new_da)
+
+    def _reset(self, new_da: DynamicArray) -> None:
+        """
+        Takes an empty table of the current capacity as a parameter. Installs it in place of the current table, resets
+        the counts and drops any incremental resize in progress. Returns None.
+        """
+        self._buckets = new_da
         self._size = 0
+        self._mod_count += 1
+        self._tombstones = 0
+        self._old_buckets = None
 
     def get_keys(self) -> DynamicArray:
         """
         Takes no parameters. Generates a Dynamic Array containing all the keys in the table. Returns the DA.
         """
 
+        # Finish any incremental resize so every key is in the current table
+        self._finish_migration()
+
         # Create a key array
         key_arr = DynamicArray()
 
@@ -237,6 +733,169 @@ class HashMap:
         # Return key array
         return key_arr
 
+    def _iter_entries(self):
+        """
+        Takes no parameters. Generator that walks the table and yields each live HashEntry in turn without copying
+        anything. Raises RuntimeError if the hash map is structurally changed while it is being walked.
+        """
+        self._finish_migration()
+        mod_count = self._mod_count
+        buckets = self._buckets
+        for num in range(self._capacity):
+            entry = buckets[num]
+            if entry is not None and not entry.is_tombstone:
+                if self._mod_count != mod_count:
+                    raise RuntimeError('HashMap changed during iteration')
+                yield entry
+
+    def keys(self):
+        """
+        Takes no parameters. Generator that lazily yields every key in the hash map.
+        """
+        for entry in self._iter_entries():
+            yield entry.key
+
+    def values(self):
+        """
+        Takes no parameters. Generator that lazily yields every value in the hash map.
+        """
+        for entry in self._iter_entries():
+            yield entry.value
+
+    def items(self):
+        """
+        Takes no parameters. Generator that lazily yields every key,value pair in the hash map as a tuple.
+        """
+        for entry in self._iter_entries():
+            yield entry.key, entry.value
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map.
+        """
+        return self.keys()
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Grows the table once for the whole batch, hashes every
+        key in one pass and puts each pair into the HashTable. Returns None.
+        """
+        pairs = list(zip(keys, values)) if values is not None else list(keys)
+
+        # Grow the table once so the load stays at or below .5 after the whole batch
+        if self._size + len(pairs) > self._capacity * 0.5:
+            self.resize_table(2 * (self._size + len(pairs)))
+
+        # Fall back to single puts while an incremental resize is in progress
+        if self._old_buckets is not None:
+            for key, value in pairs:
+                self.put(key, value)
+            return
+
+        hash_function = self._hash_function
+        hashes = [mix_hash(hash_function(key)) for key, _ in pairs]
+        buckets = self._buckets
+        capacity = self._capacity
+        mask = capacity - 1
+
+        # Probe for each key as in put, reusing the first tombstone passed only if the key is absent
+        for num in range(len(pairs)):
+            key, value = pairs[num]
+            hash = hashes[num]
+            initial_index = hash & mask
+            free_index = -1
+            found = False
+            for step in range(capacity):
+                index = (initial_index + step * (step + 1) // 2) & mask
+                entry = buckets[index]
+                if entry is None:
+                    break
+                if entry.is_tombstone:
+                    if free_index == -1:
+                        free_index = index
+                elif entry.hash == hash and entry.key == key:
+                    entry.value = value
+                    found = True
+                    break
+            if found:
+                continue
+            if free_index != -1:
+                index = free_index
+                self._tombstones -= 1
+            buckets[index] = self._new_entry(key, value, hash, buckets[index])
+            self._size += 1
+            self._mod_count += 1
+
+            # Reseeding changes every hash, so put the rest of the batch one pair at a time
+            if step > self._max_probe and self._reseed_if_flooded():
+                for key, value in pairs[num + 1:]:
+                    self.put(key, value)
+                return
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Returns a list holding the value associated with each key, or None
+        for keys that do not exist.
+        """
+
+        # Fall back to single gets while an incremental resize is in progress
+        if self._old_buckets is not None:
+            return [self.get(key) for key in keys]
+
+        hash_function = self._hash_function
+        buckets = self._buckets
+        capacity = self._capacity
+        mask = capacity - 1
+        results = []
+        for key in keys:
+            hash = mix_hash(hash_function(key))
+            initial_index = hash & mask
+            value = None
+            for step in range(capacity):
+                entry = buckets[(initial_index + step * (step + 1) // 2) & mask]
+                if entry is None:
+                    break
+                if not entry.is_tombstone and entry.hash == hash and entry.key == key:
+                    value = entry.value
+                    break
+            results.append(value)
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and turns each key,value pair that exists into a tombstone. The table
+        is compacted at most once, after the whole batch. Returns None.
+        """
+
+        # Fall back to single removes while an incremental resize is in progress
+        if self._old_buckets is not None:
+            for key in keys:
+                self.remove(key)
+            return
+
+        hash_function = self._hash_function
+        buckets = self._buckets
+        capacity = self._capacity
+        mask = capacity - 1
+        for key in keys:
+            hash = mix_hash(hash_function(key))
+            initial_index = hash & mask
+            for step in range(capacity):
+                entry = buckets[(initial_index + step * (step + 1) // 2) & mask]
+                if entry is None:
+                    break
+                if not entry.is_tombstone and entry.hash == hash and entry.key == key:
+                    entry.is_tombstone = True
+                    self._size -= 1
+                    self._mod_count += 1
+                    self._tombstones += 1
+                    break
+
+        # Compact once if the batch left too many tombstones behind
+        if self._tombstones > capacity * self._max_tombstone_load:
+            self.compact()
+
 
 # ------------------- BASIC TESTING ---------------------------------------- #
 
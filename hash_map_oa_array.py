@@ -0,0 +1,308 @@
+# Description: This script contains a HashMap class that creates an open addressing hash table ADT without any
+# per-entry objects. Keys, values and cached hash codes are stored in parallel flat arrays, and the state of every
+# slot (empty, live or tombstone) is stored in a compact bytearray. The mixed hashes are kept in an unsigned 64 bit
+# array rather than a list, so each costs 8 bytes instead of an int object and a pointer. Capacities are powers of
+# two and collisions are handled with triangular probing over a bitmask of the mixed hash, which visits every slot.
+# Removed values are left as tombstones until the table is resized or a new value is placed in their spot.
+
+
+from array import array
+
+from hash_map_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_support import mix_hash, next_power_of_two
+
+
+# Slot states stored in the state array
+_EMPTY = 0
+_LIVE = 1
+_TOMBSTONE = 2
+
+
+class HashMap:
+
+    # The table is rehashed in place at the same capacity once tombstones make up more than this fraction of it
+    _max_tombstone_load = 0.25
+
+    # Live entries and tombstones together are never allowed to fill more than this fraction of the table, so every
+    # probe for a missing key stays short
+    _MAX_OCCUPANCY = 0.75
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses triangular probing for collision resolution and stores its entries in
+        parallel arrays of keys, values, hashes and slot states. The capacity is rounded up to a power of two.
+        """
+        capacity = next_power_of_two(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', [0]) * capacity
+        self._states = bytearray(capacity)
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == _EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == _TOMBSTONE) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Takes a key and its mixed hash as parameters. Probes the table for a live slot holding the key. Returns the
+        index of the slot if found, otherwise returns -1.
+        """
+        capacity = self._capacity
+        states, keys, hashes = self._states, self._keys, self._hashes
+
+        # Probe until an empty slot ends the sequence, skipping tombstones
+        mask = capacity - 1
+        initial_index = hash & mask
+        for num in range(capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            state = states[index]
+            if state == _EMPTY:
+                return -1
+            if state == _LIVE and hashes[index] == hash and keys[index] == key:
+                return index
+        return -1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the HashTable, resizing if necessary. Returns None.
+        """
+
+        # Check the table load and double capacity if >= .5
+        if self._size >= self._capacity * 0.5:
+            self.resize_table(self._capacity * 2)
+
+        hash = mix_hash(self._hash_function(key))
+        capacity = self._capacity
+        states, keys, hashes = self._states, self._keys, self._hashes
+
+        # Probe for the key, remembering the first tombstone so it can be reused if the key is absent
+        mask = capacity - 1
+        initial_index = hash & mask
+        free_index = -1
+        for num in range(capacity):
+            index = (initial_index + num * (num + 1) // 2) & mask
+            state = states[index]
+            if state == _EMPTY:
+                if free_index == -1:
+                    free_index = index
+                break
+            if state == _TOMBSTONE:
+                if free_index == -1:
+                    free_index = index
+            elif hashes[index] == hash and keys[index] == key:
+                self._values[index] = value
+                return
+
+        # The probe visits every slot and the load is kept below .5, so a free slot is always found; should that ever
+        # fail, grow and try again rather than drop the pair
+        if free_index == -1:
+            self.resize_table(capacity * 2)
+            self.put(key, value)
+            return
+
+        # Add the pair in the first free slot found
+        if states[free_index] == _TOMBSTONE:
+            self._tombstones -= 1
+        keys[free_index] = key
+        self._values[free_index] = value
+        hashes[free_index] = hash
+        states[free_index] = _LIVE
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Resizes the table to that capacity
+        rounded up to a power of two and copies over all old values, skipping tombstones. Returns None.
+        """
+
+        # Check if the new capacity is valid
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        self._rehash(next_power_of_two(new_capacity))
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing the new capacity as a parameter. Moves every live slot into new arrays using
+        its cached hash and an insert-only probe, with no duplicate or load checks. Returns None.
+        """
+
+        # Save the old arrays and allocate new ones
+        old_keys, old_values, old_hashes, old_states = self._keys, self._values, self._hashes, self._states
+        keys = [None] * new_capacity
+        values = [None] * new_capacity
+        hashes = array('Q', [0]) * new_capacity
+        states = bytearray(new_capacity)
+        mask = new_capacity - 1
+
+        # Move live entries into the first empty slot of their probe sequence
+        for old_index in range(self._capacity):
+            if old_states[old_index] != _LIVE:
+                continue
+            hash = old_hashes[old_index]
+            initial_index = hash & mask
+            for num in range(new_capacity):
+                index = (initial_index + num * (num + 1) // 2) & mask
+                if states[index] == _EMPTY:
+                    keys[index] = old_keys[old_index]
+                    values[index] = old_values[old_index]
+                    hashes[index] = hash
+                    states[index] = _LIVE
+                    break
+
+        # Install the new arrays, which hold no tombstones
+        self._keys, self._values, self._hashes, self._states = keys, values, hashes, states
+        self._capacity = new_capacity
+        self._tombstones = 0
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        index = self._find(key, mix_hash(self._hash_function(key)))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        return self._find(key, mix_hash(self._hash_function(key))) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. If found, mark the
+        slot as a tombstone, otherwise does nothing. Compacts the table if there are too many tombstones. Returns None.
+        """
+        index = self._find(key, mix_hash(self._hash_function(key)))
+        if index == -1:
+            return None
+
+        # Release the references held by the slot and mark it as a tombstone
+        self._keys[index] = None
+        self._values[index] = None
+        self._states[index] = _TOMBSTONE
+        self._size -= 1
+        self._tombstones += 1
+        if self._tombstones > self._capacity * self._max_tombstone_load:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Takes no parameters. Rehashes the table in place at the same capacity, dropping every tombstone. Returns None.
+        """
+        self._rehash(self._capacity)
+
+    def get_tombstone_count(self) -> int:
+        """
+        Takes no parameters. Returns the number of tombstones in the table.
+        """
+        return self._tombstones
+
+    def set_tombstone_threshold(self, fraction: float) -> None:
+        """
+        Takes a float greater than 0 and at most .25 as a parameter. The table is compacted once tombstones take up
+        more than that fraction of its capacity. Live entries fill at most half the table, so the limit of .25 keeps
+        live entries and tombstones together below three quarters of it; past that, a lookup for a missing key can
+        probe a large part of the table before it reaches an empty index. Does nothing if the value is out of range.
+        Returns None.
+        """
+        if fraction <= 0 or fraction > self._MAX_OCCUPANCY - 0.5:
+            return
+        self._max_tombstone_load = fraction
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values. Returns None
+        """
+        capacity = self._capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', [0]) * capacity
+        self._states = bytearray(capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table. Returns the DA.
+        """
+        states, keys = self._states, self._keys
+        return DynamicArray([keys[num] for num in range(self._capacity) if states[num] == _LIVE])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nget / remove example")
+    print("--------------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(20):
+        m.put(i, i * 10)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    m.remove(7)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    m.put(7, 'seven')
+    print(m.get(7), m.get_size())
+
+    print("\nget_keys example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+    m.remove('100')
+    m.resize_table(40)
+    print(m.get_keys(), m.get_size(), m.get_capacity())
@@ -0,0 +1,278 @@
+# Description: This script contains a HashMap class that creates an open addressing hash table ADT using Robin Hood
+# hashing. Keys, values, cached hashes and the probe distance of every slot are stored in parallel arrays. On insert,
+# an entry that has probed further than the occupant of a slot takes that slot and the occupant moves on, which keeps
+# probe lengths short and even at high load. Removal shifts the following entries back instead of leaving tombstones.
+
+
+from array import array
+
+from hash_map_include import DynamicArray, hash_function_1, hash_function_2
+from hash_map_support import mix_hash, next_power_of_two
+
+
+class HashMap:
+
+    # The table doubles once an insert would take its load factor above _max_load. Robin Hood probing keeps lookups
+    # cheap well beyond the 0.5 used by the quadratic probing map.
+    _max_load = 0.85
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses Robin Hood linear probing for collision resolution. The capacity is rounded
+        up to a power of two. A probe distance of -1 marks an empty slot.
+        """
+        capacity = next_power_of_two(capacity)
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._dists = array('l', [-1]) * capacity
+
+        self._capacity = capacity
+        self._hash_function = function
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._dists[i] == -1:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' D: ' + str(self._dists[i]) + '\n')
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Takes a key and its mixed hash as parameters. Probes the table for the key, stopping as soon as a slot holds
+        an entry closer to its home than the key would be. Returns the index of the key if found, otherwise -1.
+        """
+        mask = self._capacity - 1
+        keys, hashes, dists = self._keys, self._hashes, self._dists
+        index = hash & mask
+        dist = 0
+        while dists[index] >= dist:
+            if hashes[index] == hash and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+            dist += 1
+        return -1
+
+    def _place(self, index: int, dist: int, key: str, value: object, hash: int) -> None:
+        """
+        Takes a starting index and probe distance together with a key, value and hash known to be absent from the
+        table. Places the entry with Robin Hood displacement, carrying each displaced occupant forward until an empty
+        slot is reached. Returns None.
+        """
+        mask = self._capacity - 1
+        keys, values, hashes, dists = self._keys, self._values, self._hashes, self._dists
+        while True:
+            current = dists[index]
+
+            # Take an empty slot and stop
+            if current == -1:
+                keys[index], values[index], hashes[index], dists[index] = key, value, hash, dist
+                return
+
+            # Take the slot from an entry that is closer to its home, and carry that entry forward instead
+            if current < dist:
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                hashes[index], hash = hash, hashes[index]
+                dists[index], dist = dist, current
+
+            index = (index + 1) & mask
+            dist += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the HashTable, resizing if necessary. Returns None.
+        """
+
+        # Double the capacity if one more entry would take the load above the maximum
+        if self._size + 1 > self._capacity * self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        hash = mix_hash(self._hash_function(key))
+        mask = self._capacity - 1
+        keys, hashes, dists = self._keys, self._hashes, self._dists
+
+        # Probe for the key until reaching a slot whose entry is closer to its home than the key would be
+        index = hash & mask
+        dist = 0
+        while dists[index] >= dist:
+            if hashes[index] == hash and keys[index] == key:
+                self._values[index] = value
+                return
+            index = (index + 1) & mask
+            dist += 1
+
+        # The key is absent, so insert it from that slot onwards
+        self._place(index, dist, key, value, hash)
+        self._size += 1
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        return self._capacity - self._size
+
+    def set_max_load(self, max_load: float) -> None:
+        """
+        Takes a float between 0 and 1 representing the maximum load factor as a parameter. Later inserts double the
+        capacity once the load would go above it. Does nothing if the value is out of range. Returns None.
+        """
+        if max_load <= 0 or max_load >= 1:
+            return
+        self._max_load = max_load
+
+    def max_probe_length(self) -> int:
+        """
+        Takes no parameters. Returns the longest probe distance of any entry in the table, or 0 if it is empty.
+        """
+        return max(max(self._dists), 0)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing a new capacity for the table as a parameter. Resizes the table to that capacity
+        rounded up to a power of two and reinserts all values using their cached hashes. Returns None.
+        """
+
+        # Check if the new capacity is valid
+        if new_capacity < 1 or new_capacity < self._size:
+            return
+        new_capacity = next_power_of_two(new_capacity)
+
+        # Save the old arrays and install new ones
+        old_keys, old_values, old_hashes, old_dists = self._keys, self._values, self._hashes, self._dists
+        old_capacity = self._capacity
+        self._keys = [None] * new_capacity
+        self._values = [None] * new_capacity
+        self._hashes = [0] * new_capacity
+        self._dists = array('l', [-1]) * new_capacity
+        self._capacity = new_capacity
+
+        # Reinsert every entry; keys are unique, so no duplicate checks are needed
+        mask = new_capacity - 1
+        for num in range(old_capacity):
+            if old_dists[num] != -1:
+                hash = old_hashes[num]
+                self._place(hash & mask, 0, old_keys[num], old_values[num], hash)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        index = self._find(key, mix_hash(self._hash_function(key)))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        return self._find(key, mix_hash(self._hash_function(key))) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. If found, the
+        entries after it in the same run are shifted back one slot, so no tombstone is left. Returns None.
+        """
+        index = self._find(key, mix_hash(self._hash_function(key)))
+        if index == -1:
+            return None
+
+        # Shift each following entry that is away from its home back by one slot
+        mask = self._capacity - 1
+        keys, values, hashes, dists = self._keys, self._values, self._hashes, self._dists
+        next_index = (index + 1) & mask
+        while dists[next_index] > 0:
+            keys[index] = keys[next_index]
+            values[index] = values[next_index]
+            hashes[index] = hashes[next_index]
+            dists[index] = dists[next_index] - 1
+            index = next_index
+            next_index = (next_index + 1) & mask
+
+        # Empty the last slot of the run
+        keys[index] = None
+        values[index] = None
+        dists[index] = -1
+        self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the table of any values. Returns None
+        """
+        capacity = self._capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._dists = array('l', [-1]) * capacity
+        self._size = 0
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the table. Returns the DA.
+        """
+        dists, keys = self._dists, self._keys
+        return DynamicArray([keys[num] for num in range(self._capacity) if dists[num] != -1])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(50, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity(), m.max_probe_length())
+
+    print("\nremove example")
+    print("--------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(12):
+        m.put(i, i * 10)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    m.remove(7)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    print(m)
+
+    print("\nget_keys example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+    m.remove('100')
+    m.resize_table(40)
+    print(m.get_keys(), m.get_size(), m.get_capacity())
@@ -1,13 +1,61 @@
 # Name: Taylor Garrison
 # Description: This script contains a HashMap class that creates a hash table ADT that utilizes linked lists to store
 # its data. Collisions are handled by chaining so that values with the same indices are stored in the same linked list.
+# The table doubles or halves automatically when its load factor leaves the configured thresholds, and a bucket whose
+# chain grows long is converted to a sorted TreeBucket so that lookups in it stay logarithmic.
 
 
-from hash_map_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+from hash_map_include import DynamicArray, LinkedList, SLNode, hash_function_1, hash_function_2
+from hash_map_support import TreeBucket, FreeList
 
 
 class HashMap:
+
+    # Incremental resizing is disabled by default. When enabled, the old bucket array is kept alongside the new one
+    # and each put, get and remove migrates a bounded number of old buckets until the old array is empty.
+    _migrate_step = 0
+    _old_buckets = None
+    _old_capacity = 0
+    _migrate_index = 0
+
+    # While incremental resizing is on, the bucket array for the next growth is allocated _alloc_chunk buckets per
+    # insert instead of all at once, and the migration begins when it is complete
+    _growing_da = None
+    _growing_da_capacity = 0
+    _alloc_chunk = 1024
+
+    # Counts structural changes (inserts, removals, clears and resizes) so lazy iterators can detect them
+    _mod_count = 0
+
+    # Load factor thresholds for automatic resizing. The map doubles when its load goes above _max_load and halves
+    # (never below _MIN_CAPACITY buckets or the capacity given to the constructor) when it drops below _min_load.
+    # _min_load is kept at most a quarter of _max_load, so a map that has just grown or shrunk sits in the middle of
+    # the band and cannot thrash. The constructor's capacity is recorded the first time the capacity changes.
+    _max_load = 1.0
+    _min_load = 0.25
+    _MIN_CAPACITY = 8
+    _initial_capacity = 0
+
+    # A chain longer than _max_chain is far beyond what a random hash produces at these loads, so it is treated as a
+    # flood of colliding keys. If the hash function can be reseeded (see hash_functions.SeededHash), the map switches
+    # to a freshly seeded copy and rehashes, at most once each time the size doubles.
+    _max_chain = 32
+    _reseed_size = 0
+
+    # A bucket becomes a TreeBucket once it holds more than _treeify_length nodes, and goes back to a LinkedList when
+    # it drops below _untreeify_length. The gap between the two keeps a bucket from converting back and forth.
+    _treeify_length = 8
+    _untreeify_length = 6
+
+    # Nodes released by remove and clear are kept on a free list of up to _free_limit nodes, created on first use, and
+    # reused by later inserts instead of allocating new ones
+    _free_nodes = None
+    _free_limit = 1024
+
+    # Class of the nodes the map creates. A subclass of the map can use a subclass of SLNode to keep its own per-key
+    # fields on the chain nodes themselves (see hash_map_cache).
+    _node_class = SLNode
+
     def __init__(self, capacity: int, function) -> None:
         """
         Initialize new HashMap that uses
@@ -51,31 +99,179 @@ class HashMap:
     def put(self, key: str, value: object) -> None:
         """
         Takes two parameters; a string that represents a key and an object that represents a value. Puts the key,
-        value pair into the hash map. If the key already exists the value associated with it is updated. Returns None.
+        value pair into the hash map. If the key already exists the value associated with it is updated. Doubles the
+        capacity if the load factor goes above the maximum load threshold. Returns None.
         """
+        self._put_hashed(key, value, self._hash_function(key))
 
-        # Calculate the index
-        index = self._hash_function(key) % self._capacity
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        Takes a key, a value and the full hash of the key as parameters. Puts the key,value pair into the hash map
+        without invoking the hash function, growing the table if needed. Returns None.
+        """
 
-        # Insert the pair if the linked list is empty
-        if self._buckets[index].length() == 0:
-            self._buckets[index].insert(key, value)
+        # Calculate the index
+        index = hash % self._capacity
+
+        # During an incremental resize, migrate a few buckets and update the key in place if it is still in the old
+        # array
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            node = self._find_old(key, hash)
+            if node is not None:
+                node.value = value
+                return
+
+        # Insert the pair if the bucket is empty
+        bucket = self._buckets[index]
+        if bucket.length() == 0:
+            bucket.insert_node(self._new_node(key, value, hash))
             self._size += 1
+            self._mod_count += 1
 
-        # Iterate through the linked list and insert or add a new node
+        # Search the bucket, comparing cached hashes before keys, and update or add a new node
         else:
-            for node in self._buckets[index]:
-                if node.key == key:
-                    node.value = value
-                    return
-            self._buckets[index].insert(key, value)
+            node = bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+                return
+            bucket.insert_node(self._new_node(key, value, hash))
             self._size += 1
+            self._mod_count += 1
+            if bucket.length() > min(self._treeify_length, self._max_chain):
+                self._bucket_grew(index)
+
+        # Grow the table if the new pair pushed the load above the maximum
+        if self._size > self._capacity * self._max_load:
+            self._grow()
+
+    def _find_or_insert(self, key: str, value: object) -> (SLNode, bool):
+        """
+        Takes a key and a value as parameters. Finds the node holding the key, or inserts a new node with the given
+        value if the key does not exist, growing the table if needed. Returns the node and whether it was inserted.
+        """
+        hash = self._hash_function(key)
+        node = self._probe(key, hash)
+        if node is not None:
+            return node, False
+        return self._add_node(key, value, hash), True
+
+    def _probe(self, key: str, hash: int) -> SLNode:
+        """
+        Takes a key and its full hash as parameters. Migrates a few buckets during an incremental resize, then
+        searches the old array and the key's bucket, comparing cached hashes before keys. Returns the node holding the
+        key, or None if it is not there.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            node = self._find_old(key, hash)
+            if node is not None:
+                return node
+        return self._buckets[hash % self._capacity].contains(key, hash)
+
+    def _add_node(self, key: str, value: object, hash: int) -> SLNode:
+        """
+        Takes a key that _probe did not find, a value and the full hash of the key as parameters. Inserts a new node
+        for them without searching again, growing the table if needed. Returns the node.
+        """
+
+        # Insert a new node; growing the table or converting the bucket later relinks the same node object
+        index = hash % self._capacity
+        bucket = self._buckets[index]
+        node = self._new_node(key, value, hash)
+        bucket.insert_node(node)
+        self._size += 1
+        self._mod_count += 1
+        if bucket.length() > min(self._treeify_length, self._max_chain):
+            self._bucket_grew(index)
+        if self._size > self._capacity * self._max_load:
+            self._grow()
+        return node
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Takes a key and an optional default value as parameters. Returns the value associated with the key, first
+        putting the default into the hash map if the key does not exist. The key is hashed and probed once.
+        """
+        return self._find_or_insert(key, default)[0].value
+
+    def get_or_put(self, key: str, factory) -> object:
+        """
+        Takes a key and a function taking no arguments as parameters. Returns the value associated with the key. If
+        the key does not exist, the function is called and its result is put into the hash map and returned. The key
+        is hashed and probed once, and nothing is put if the function raises an exception.
+        """
+        hash = self._hash_function(key)
+        node = self._probe(key, hash)
+        if node is not None:
+            return node.value
+        mod_count = self._mod_count
+        value = factory()
+
+        # The factory may have changed the map, even reseeding its hash function, so only then is the key found again
+        if self._mod_count != mod_count:
+            return self._find_or_insert(key, value)[0].value
+        return self._add_node(key, value, hash).value
+
+    def update(self, key: str, function, default: object = None) -> object:
+        """
+        Takes a key, a function taking one argument and an optional default value as parameters. Replaces the value
+        associated with the key by the result of calling the function on it, starting from the default if the key
+        does not exist. The key is hashed and probed once, and nothing is changed if the function raises an exception.
+        Returns the new value.
+        """
+        hash = self._hash_function(key)
+        node = self._probe(key, hash)
+        mod_count = self._mod_count
+        value = function(node.value if node is not None else default)
+
+        # The function may have removed the key and let its node be reused for another one, so find it again if the
+        # map changed, and otherwise add the key if it was missing
+        if self._mod_count != mod_count:
+            node = self._find_or_insert(key, value)[0]
+        elif node is None:
+            return self._add_node(key, value, hash).value
+        node.value = value
+        return value
+
+    def increment(self, key: str, amount=1):
+        """
+        Takes a key and an optional amount as parameters. Adds the amount to the value associated with the key,
+        starting from 0 if the key does not exist. The key is hashed and probed once, and nothing is changed if the
+        addition raises an exception. Returns the new value.
+        """
+        hash = self._hash_function(key)
+        node = self._probe(key, hash)
+        if node is not None:
+            node.value += amount
+            return node.value
+        return self._add_node(key, 0 + amount, hash).value
+
+    def get_node(self, key: str) -> SLNode:
+        """
+        Takes a key as a parameter. Returns the node holding the key, or None if the key does not exist. The node
+        belongs to the hash map: its value may be changed, but it stays valid only until the key is removed.
+        """
+        return self._probe(key, self._hash_function(key))
+
+    def upsert(self, key: str, value: object) -> (SLNode, bool):
+        """
+        Takes a key and a value as parameters. Puts the pair into the hash map like put, with a single probe. Returns
+        the node holding the key, on the same terms as get_node, and whether it was inserted.
+        """
+        node, inserted = self._find_or_insert(key, value)
+        if not inserted:
+            node.value = value
+        return node, inserted
 
     def empty_buckets(self) -> int:
         """
         Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
         """
 
+        # Finish any incremental resize so every node is in the current array
+        self._finish_migration()
+
         # Set a counter and count the number of linked lists with a length of 0
         counter = 0
         for num in range(self._capacity):
@@ -94,42 +290,234 @@ class HashMap:
         Takes no parameters. Clears the hash map of any contained data. Returns None.
         """
 
-        # Set buckets to a new array and add the appropriate number of linked lists
-        self._buckets = DynamicArray()
+        # Keep nodes for reuse until the free list is full, then drop the rest with the old array
+        for num in range(self._capacity):
+            if not all(self._release_node(node) for node in self._buckets[num]):
+                break
+
+        # Create a new array and add the appropriate number of linked lists
+        new_da = DynamicArray()
         for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+            new_da.append(LinkedList())
+        self._reset(new_da)
+
+    def _new_node(self, key: str, value: object, hash: int) -> SLNode:
+        """
+        Takes a key, a value and the full hash of the key as parameters. Returns a node holding them, reusing one from
+        the free list if there is one.
+        """
+        node = self._free_nodes.pop() if self._free_nodes is not None else None
+        if node is None:
+            return self._node_class(key, value, None, hash)
+        node.key = key
+        node.value = value
+        node.hash = hash
+        return node
+
+    def _release_node(self, node: SLNode) -> bool:
+        """
+        Takes a node that has been removed from the hash map as a parameter and puts it on the free list. Returns
+        False if the free list is full, otherwise returns True.
+        """
+        if self._free_nodes is None:
+            self._free_nodes = FreeList(self._free_limit)
+        node.next = None
+        return self._free_nodes.push(node)
 
-        # Reset the size
+    def _reset(self, new_da: DynamicArray) -> None:
+        """
+        Takes an empty bucket array of the current capacity as a parameter. Installs it in place of the current array,
+        resets the size and drops any incremental resize in progress. Returns None.
+        """
+        self._buckets = new_da
         self._size = 0
+        self._mod_count += 1
+        self._old_buckets = None
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Takes an integer as a parameter that represents the new capacity for the hash map. Updates the hash map to
-        have a new capacity and copies over all old data in the new hash map. Returns None.
+        have a new capacity and copies over all old data in the new hash map using the cached hash of each key.
+        Returns None.
         """
 
         # Return if the new capacity is too small
         if new_capacity < 1:
             return
 
+        # Finish any incremental resize already in progress, then either start a new one or rehash everything now
+        self._finish_migration()
+        if self._migrate_step:
+            self._begin_migration(new_capacity)
+        else:
+            self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing the new capacity as a parameter. Moves every existing node into a new bucket
+        array using its cached hash. Keys are already unique, so no duplicate or load checks are made. Returns None.
+        """
+
         # Create a new array and add the new number of linked lists
         new_da = DynamicArray()
         for _ in range(new_capacity):
             new_da.append(LinkedList())
 
-        # Save the capacity and old DA and reassign buckets, capacity and size
-        old_capacity = self._capacity
+        # Relink each node into its new bucket, converting buckets that grow long; the iterator has already advanced
+        # past a node before it is handed out, so moving it does not disturb the walk through the old bucket
         old_buckets = self._buckets
+        for num in range(self._capacity):
+            if old_buckets[num].length() != 0:
+                for node in old_buckets[num]:
+                    index = node.hash % new_capacity
+                    bucket = new_da[index]
+                    bucket.insert_node(node)
+                    if bucket.length() > self._treeify_length:
+                        self._fit_bucket(new_da, index)
+
+        # Reassign buckets and capacity
         self._buckets = new_da
+        if not self._initial_capacity:
+            self._initial_capacity = self._capacity
         self._capacity = new_capacity
-        self._size = 0
+        self._mod_count += 1
+
+    def _grow(self) -> None:
+        """
+        Takes no parameters. Doubles the capacity of the hash map. With incremental resizing on, the new bucket array
+        is built _alloc_chunk buckets at a time by the inserts that keep finding the load too high, and is only
+        installed once it is complete, so no single insert allocates the whole bucket array. Returns None.
+        """
+        new_capacity = self._capacity * 2
+        if not self._migrate_step:
+            self.resize_table(new_capacity)
+            return
+
+        # Start building a new bucket array unless one of the right capacity is already under way, then add the next
+        # chunk
+        if self._growing_da is None or self._growing_da_capacity != new_capacity:
+            self._growing_da = DynamicArray()
+            self._growing_da_capacity = new_capacity
+        new_da = self._growing_da
+        for _ in range(min(self._alloc_chunk, new_capacity - new_da.length())):
+            new_da.append(LinkedList())
 
-        # Add the values from the old array to the new array using put
-        for num in range(old_capacity):
+        # Begin migrating into the bucket array once every bucket exists
+        if new_da.length() == new_capacity:
+            self._growing_da = None
+            self._finish_migration()
+            self._begin_migration(new_capacity, new_da)
+
+    def set_incremental_resize(self, step: int) -> None:
+        """
+        Takes an integer representing the number of old buckets to migrate per operation as a parameter. A positive
+        step makes later resizes incremental, so put, get and remove each move at most that many buckets instead of
+        rehashing the whole table at once. A step of 0 finishes any resize in progress and disables the mode.
+        Returns None.
+        """
+        if step < 0:
+            return
+        if step == 0:
+            self._finish_migration()
+        self._migrate_step = step
+
+    def _begin_migration(self, new_capacity: int, new_da: DynamicArray = None) -> None:
+        """
+        Takes an integer representing the new capacity and an optional empty bucket array of that capacity as
+        parameters. Installs the array, allocating it if none is given, and keeps the current array as the old array
+        to be migrated incrementally. Returns None.
+        """
+        if new_da is None:
+            new_da = DynamicArray()
+            for _ in range(new_capacity):
+                new_da.append(LinkedList())
+
+        self._old_buckets = self._buckets
+        self._old_capacity = self._capacity
+        self._migrate_index = 0
+        self._buckets = new_da
+        if not self._initial_capacity:
+            self._initial_capacity = self._capacity
+        self._capacity = new_capacity
+        self._mod_count += 1
+
+    def _migrate(self, count: int) -> None:
+        """
+        Takes an integer as a parameter and relinks the nodes of up to that many old buckets into the current array.
+        Migrated buckets are never searched again. Returns None.
+        """
+        old_buckets, new_buckets, new_capacity = self._old_buckets, self._buckets, self._capacity
+        start = self._migrate_index
+        end = min(start + count, self._old_capacity)
+
+        for num in range(start, end):
             if old_buckets[num].length() != 0:
                 for node in old_buckets[num]:
-                    self.put(node.key, node.value)
+                    index = node.hash % new_capacity
+                    bucket = new_buckets[index]
+                    bucket.insert_node(node)
+                    if bucket.length() > self._treeify_length:
+                        self._fit_bucket(new_buckets, index)
+
+        # Drop the old array once every bucket has been migrated
+        self._migrate_index = end
+        if end == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Takes no parameters. Migrates every remaining old bucket if an incremental resize is in progress. Returns None.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def migration_source(self) -> DynamicArray:
+        """
+        Takes no parameters. Returns the old bucket array an incremental resize is moving nodes out of, or None if no
+        resize is in progress. With migrate_step, begin_resize and reset, this lets a caller such as hash_map_async
+        drive a resize or clear in steps.
+        """
+        return self._old_buckets
+
+    def migrate_step(self, count: int) -> None:
+        """
+        Takes an integer as a parameter. Moves up to that many old buckets into the current bucket array if an
+        incremental resize is in progress. Returns None.
+        """
+        if self._old_buckets is not None:
+            self._migrate(count)
 
+    def begin_resize(self, new_da: DynamicArray) -> None:
+        """
+        Takes an empty bucket array as a parameter. Finishes any incremental resize in progress, then starts a new one
+        into the given bucket array, whose length becomes the capacity. An empty array is ignored. Returns None.
+        """
+        capacity = new_da.length()
+        if capacity < 1:
+            return
+        self._finish_migration()
+        self._begin_migration(capacity, new_da)
+
+    def reset(self, new_da: DynamicArray) -> list:
+        """
+        Takes an empty bucket array of the current capacity as a parameter. Installs it in place of the current bucket
+        array, emptying the hash map. Returns a list of the bucket arrays it replaced, so the caller can release them.
+        """
+        replaced = [self._buckets] if self._old_buckets is None else [self._buckets, self._old_buckets]
+        self._reset(new_da)
+        return replaced
+
+    def _find_old(self, key: str, hash: int) -> SLNode:
+        """
+        Takes a key and its full hash as parameters. Searches the old bucket for the key if it has not been migrated
+        yet. Returns the node holding the key, or None if it is not there.
+        """
+        if self._old_buckets is None:
+            return None
+        index = hash % self._old_capacity
+        if index < self._migrate_index:
+            return None
+        return self._old_buckets[index].contains(key, hash)
 
     def get(self, key: str) -> object:
         """
@@ -137,17 +525,24 @@ class HashMap:
         exist, returns None.
         """
 
-        # Determine the index
-        index = self._hash_function(key) % self._capacity
+        # Determine the full hash and the index
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+
+        # During an incremental resize, migrate a few buckets and check the old array first
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            node = self._find_old(key, hash)
+            if node is not None:
+                return node.value
 
-        # Search for the key, returning None if isn't found
-        if self._buckets[index].length() == 0:
+        # Search for the key, comparing cached hashes before keys, returning None if isn't found
+        bucket = self._buckets[index]
+        if bucket.length() == 0:
             return None
         else:
-            for node in self._buckets[index]:
-                if node.key == key:
-                    return node.value
-            return None
+            node = bucket.contains(key, hash)
+            return node.value if node is not None else None
 
     def contains_key(self, key: str) -> bool:
         """
@@ -163,20 +558,128 @@ class HashMap:
     def remove(self, key: str) -> None:
         """
         Takes a string representing a key and attempts to remove the key,value pair from the hash map. Does nothing if
-        key does not exist. Returns None.
+        key does not exist. Halves the capacity if the load factor drops below the minimum load threshold. Returns
+        None.
         """
 
-        # If the hash map contains the key, calculate its index, remove it, and decrement size
-        if self.contains_key(key):
-            index = self._hash_function(key) % self._capacity
-            self._buckets[index].remove(key)
+        # Calculate the full hash and the index
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+
+        # During an incremental resize, migrate a few buckets and remove the key from the old array if it is there
+        if self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+            old_index = hash % self._old_capacity
+            if self._old_buckets is not None and old_index >= self._migrate_index:
+                node = self._old_buckets[old_index].remove_node(key, hash)
+                if node is not None:
+                    self._size -= 1
+                    self._mod_count += 1
+                    self._release_node(node)
+                    self._fit_bucket(self._old_buckets, old_index)
+                    self._shrink_if_sparse()
+                    return
+
+        # Decrement size if the key was removed from its bucket, and keep the node for reuse
+        node = self._buckets[index].remove_node(key, hash)
+        if node is not None:
             self._size -= 1
+            self._mod_count += 1
+            self._release_node(node)
+            self._fit_bucket(self._buckets, index)
+            self._shrink_if_sparse()
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Takes no parameters. Halves the capacity, as many times as needed, while the load factor is below the minimum
+        load threshold, without going below the minimum capacity or the capacity given to the constructor. Returns
+        None.
+        """
+        capacity = self._capacity
+        floor = max(self._MIN_CAPACITY, self._initial_capacity or self._capacity)
+        while self._size < capacity * self._min_load and capacity > floor:
+            capacity = max(capacity // 2, floor)
+        if capacity != self._capacity:
+            self.resize_table(capacity)
+
+    def _fit_bucket(self, buckets: DynamicArray, index: int) -> None:
+        """
+        Takes a bucket array and an index as parameters. Converts the LinkedList at the index to a TreeBucket if it
+        holds more than _treeify_length nodes, or the TreeBucket at the index back to a LinkedList if it holds fewer
+        than _untreeify_length nodes. The same node objects are relinked either way. Returns None.
+        """
+        bucket = buckets[index]
+        if type(bucket) is LinkedList:
+            if bucket.length() > self._treeify_length:
+                buckets[index] = TreeBucket(bucket)
+        elif bucket.length() < self._untreeify_length:
+            linked_list = LinkedList()
+            for node in bucket:
+                linked_list.insert_node(node)
+            buckets[index] = linked_list
+
+    def _bucket_grew(self, index: int) -> bool:
+        """
+        Takes the index of a bucket that has just had a node added as a parameter. Reseeds the hash function if the
+        bucket is longer than _max_chain and the function supports it, and otherwise converts the bucket to a
+        TreeBucket if it has grown long. Returns True if the map was reseeded, otherwise returns False.
+        """
+        if self._buckets[index].length() > self._max_chain and self._reseed_if_flooded():
+            return True
+        self._fit_bucket(self._buckets, index)
+        return False
+
+    def _reseed_if_flooded(self) -> bool:
+        """
+        Takes no parameters. Called when a chain grows longer than _max_chain. If the hash function has a reseeded
+        method and the size has at least doubled since the last reseed, replaces the function with a reseeded copy,
+        recomputes the cached hash of every node and rehashes the table at the same capacity. Returns True if the map
+        was reseeded, otherwise returns False.
+        """
+        reseeded = getattr(self._hash_function, 'reseeded', None)
+        if reseeded is None or self._size < 2 * self._reseed_size:
+            return False
+
+        # Finish any incremental resize, then give every node its hash under the new seed
+        self._finish_migration()
+        self._hash_function = reseeded()
+        hash_function = self._hash_function
+        for num in range(self._capacity):
+            for node in self._buckets[num]:
+                node.hash = hash_function(node.key)
+        self._rehash(self._capacity)
+        self._reseed_size = self._size
+        return True
+
+    def set_chain_limit(self, length: int) -> None:
+        """
+        Takes a positive integer as a parameter. A chain longer than that is treated as a flood of colliding keys and
+        makes the map reseed its hash function, if the function supports it. Does nothing if the value is not
+        positive. Returns None.
+        """
+        if length < 1:
+            return
+        self._max_chain = length
+
+    def set_load_thresholds(self, max_load: float, min_load: float) -> None:
+        """
+        Takes two floats representing the maximum and minimum load factors as parameters. The map grows when its load
+        goes above max_load and shrinks when it drops below min_load; a min_load of 0 disables shrinking. Does nothing
+        unless max_load is positive and min_load is between 0 and a quarter of max_load. Returns None.
+        """
+        if max_load <= 0 or min_load < 0 or min_load > max_load / 4:
+            return
+        self._max_load = max_load
+        self._min_load = min_load
 
     def get_keys(self) -> DynamicArray:
         """
         Takes no parameters. Creates a Dynamic Array containing all the keys in the hash map. Returns the DA.
         """
 
+        # Finish any incremental resize so every key is in the current array
+        self._finish_migration()
+
         # Create an array and iterate through non-empty linked lists, adding each key to the DA
         key_arr = DynamicArray()
         for num in range(self._capacity):
@@ -187,52 +690,171 @@ class HashMap:
         # Return the key array
         return key_arr
 
+    def _iter_nodes(self):
+        """
+        Takes no parameters. Generator that walks the buckets and yields each node in turn without copying anything.
+        Raises RuntimeError if the hash map is structurally changed while it is being walked.
+        """
+        self._finish_migration()
+        mod_count = self._mod_count
+        buckets = self._buckets
+        for num in range(self._capacity):
+            for node in buckets[num]:
+                if self._mod_count != mod_count:
+                    raise RuntimeError('HashMap changed during iteration')
+                yield node
+
+    def keys(self):
+        """
+        Takes no parameters. Generator that lazily yields every key in the hash map.
+        """
+        for node in self._iter_nodes():
+            yield node.key
+
+    def values(self):
+        """
+        Takes no parameters. Generator that lazily yields every value in the hash map.
+        """
+        for node in self._iter_nodes():
+            yield node.value
+
+    def items(self):
+        """
+        Takes no parameters. Generator that lazily yields every key,value pair in the hash map as a tuple.
+        """
+        for node in self._iter_nodes():
+            yield node.key, node.value
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map.
+        """
+        return self.keys()
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Grows the table once for the whole batch, hashes every
+        key in one pass and puts each pair into the hash map. Returns None.
+        """
+        pairs = list(zip(keys, values)) if values is not None else list(keys)
+
+        # Grow the table once so the whole batch fits under the maximum load
+        capacity = max(self._capacity, 1)
+        while self._size + len(pairs) > capacity * self._max_load:
+            capacity *= 2
+        if capacity != self._capacity:
+            self.resize_table(capacity)
+
+        # Fall back to single puts while an incremental resize is in progress
+        if self._old_buckets is not None:
+            for key, value in pairs:
+                self.put(key, value)
+            return
+
+        hash_function = self._hash_function
+        hashes = [hash_function(key) for key, _ in pairs]
+        buckets, capacity = self._buckets, self._capacity
+
+        # Update each key in its bucket, or add a new node if it is not there
+        treeify_length = min(self._treeify_length, self._max_chain)
+        for num in range(len(pairs)):
+            key, value = pairs[num]
+            hash = hashes[num]
+            index = hash % capacity
+            bucket = buckets[index]
+            node = bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+                continue
+            bucket.insert_node(self._new_node(key, value, hash))
+            self._size += 1
+            self._mod_count += 1
+
+            # Reseeding changes every hash, so put the rest of the batch one pair at a time
+            if bucket.length() > treeify_length and self._bucket_grew(index):
+                for key, value in pairs[num + 1:]:
+                    self.put(key, value)
+                return
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Returns a list holding the value associated with each key, or None
+        for keys that do not exist.
+        """
+
+        # Fall back to single gets while an incremental resize is in progress
+        if self._old_buckets is not None:
+            return [self.get(key) for key in keys]
+
+        hash_function = self._hash_function
+        buckets, capacity = self._buckets, self._capacity
+        results = []
+        for key in keys:
+            hash = hash_function(key)
+            node = buckets[hash % capacity].contains(key, hash)
+            results.append(node.value if node is not None else None)
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and removes each key,value pair that exists from the hash map. The
+        table is shrunk at most once, after the whole batch. Returns None.
+        """
+
+        # Fall back to single removes while an incremental resize is in progress
+        if self._old_buckets is not None:
+            for key in keys:
+                self.remove(key)
+            return
+
+        hash_function = self._hash_function
+        buckets, capacity = self._buckets, self._capacity
+        for key in keys:
+            hash = hash_function(key)
+            index = hash % capacity
+            node = buckets[index].remove_node(key, hash)
+            if node is not None:
+                self._size -= 1
+                self._mod_count += 1
+                self._release_node(node)
+                self._fit_bucket(buckets, index)
+        self._shrink_if_sparse()
+
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
     """
     Takes a Dynamic Array as a parameter. Uses the hash map class to find the mode of the dynamic array (if there are
-    multiple modes they are all recorded). Returns a new Dynamic Array containing the mode(s) and the frequency.
+    multiple modes they are all recorded) in a single pass, counting each element with one hash and probe and keeping
+    track of the highest frequency as it goes. Elements are used as keys as they are, so they only need to be hashable.
+    Returns a new Dynamic Array containing the mode(s) and the frequency, which is 0 for an empty array.
     """
 
-    # Create a map
-    map = HashMap(da.length() // 3, hash_function_1)
-
-    # Iterate through the DA, adding objects as keys with a value of 1 (starting frequency)
-    for num in range(da.length()):
-        if not map.contains_key(str(da[num])):
-            map.put(str(da[num]), 1)
-
-        # If the map already has an object as a key, update its value to be one higher
-        else:
-            current_freq = map.get(str(da[num]))
-            current_freq += 1
-            map.put(str(da[num]), current_freq)
+    # Create a map sized from the input length, with at least one bucket; it grows on its own if needed
+    map = HashMap(max(da.length() // 3, 1), hash)
 
-    # Create an array of the keys and an array for recording modes and a temporary frequency tracker
-    keys = map.get_keys()
+    # Create an array for recording modes and a frequency tracker
     mode_da = DynamicArray()
-    total_freq = -1
+    total_freq = 0
 
-    # Iterate through the key array and use the values stored in the map to determine the mode
-    for num in range(keys.length()):
-        temp_freq = map.get(keys[num])
+    # Iterate through the DA, incrementing the frequency of each element
+    for num in range(da.length()):
+        temp_freq = map.increment(da[num])
 
         # If the frequency of a value is more than the current frequency, reset the mode array and add the value
         if temp_freq > total_freq:
             mode_da = DynamicArray()
-            mode_da.append(keys[num])
+            mode_da.append(da[num])
             total_freq = temp_freq
 
-        # If they are equal, add the value to the mode array
+        # If they are equal, add the value to the mode array; frequencies only grow, so each value is added once
         elif temp_freq == total_freq:
-            mode_da.append(keys[num])
+            mode_da.append(da[num])
 
     # Return the mode array and the frequency of the mode(s)
     return mode_da, total_freq
 
 
-
-
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -0,0 +1,545 @@
+# Description: This script contains a HashMap class that creates a separate chaining hash table ADT without any
+# per-bucket or per-entry objects. The head of every bucket's chain is an index stored in a flat integer array, and
+# the entries live in a pool of parallel lists of keys, values and hash codes, linked into chains by a parallel array
+# of next indices. Removed entries are put on a free list threaded through the same next array and reused by later
+# inserts. Creating a large, mostly empty map allocates a single array, and the garbage collector only has the pool
+# lists to scan. The table doubles or halves automatically when its load factor leaves the configured thresholds.
+
+
+from array import array
+
+from hash_map_include import DynamicArray, hash_function_1, hash_function_2
+
+
+# Marks a pool slot that is on the free list, since None is a valid key
+_FREE = object()
+
+
+class HashMap:
+
+    # Load factor thresholds for automatic resizing, as in the separate chaining HashMap, which never shrinks below the
+    # capacity given to the constructor
+    _max_load = 1.0
+    _min_load = 0.25
+    _MIN_CAPACITY = 8
+
+    # A chain longer than _max_chain makes the map reseed its hash function, if the function supports it (see
+    # hash_functions.SeededHash), at most once each time the size doubles
+    _max_chain = 32
+    _reseed_size = 0
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses separate chaining for collision resolution, with the chains stored as
+        indices into a pool of parallel key, value, hash and next arrays
+        """
+        capacity = max(capacity, 1)
+        self._heads = array('l', [-1]) * capacity
+        self._keys = []
+        self._values = []
+        self._hashes = []
+        self._next = array('l')
+        self._free = -1
+
+        self._capacity = capacity
+        self._initial_capacity = capacity
+        self._hash_function = function
+        self._size = 0
+        self._mod_count = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as the separate chaining HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            nodes = []
+            index = self._heads[i]
+            while index != -1:
+                nodes.append('(' + str(self._keys[index]) + ': ' + str(self._values[index]) + ')')
+                index = self._next[index]
+            out += str(i) + ': SLL [' + ' -> '.join(nodes) + ']\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+        """
+        Takes a key and its full hash as parameters. Walks the key's chain, comparing cached hashes before keys.
+        Returns the pool index of the entry holding the key if found, otherwise returns -1.
+        """
+        keys, hashes, links = self._keys, self._hashes, self._next
+        index = self._heads[hash % self._capacity]
+        while index != -1:
+            if hashes[index] == hash and keys[index] == key:
+                return index
+            index = links[index]
+        return -1
+
+    def _find_or_insert(self, key: str, value: object) -> (int, bool):
+        """
+        Takes a key and a value as parameters. Finds the entry holding the key, or adds a new entry with the given
+        value if the key does not exist. Returns the pool index of the entry and whether it was added.
+        """
+        hash = self._hash_function(key)
+        index, length = self._probe(key, hash)
+        if index != -1:
+            return index, False
+        return self._insert(key, value, hash, length), True
+
+    def _probe(self, key: str, hash: int) -> (int, int):
+        """
+        Takes a key and its full hash as parameters. Walks the key's chain, counting its length in case it has to be
+        reseeded. Returns the pool index of the entry holding the key, or -1 if it is not there, and the length.
+        """
+        keys, hashes, links = self._keys, self._hashes, self._next
+        index = self._heads[hash % self._capacity]
+        length = 0
+        while index != -1:
+            if hashes[index] == hash and keys[index] == key:
+                return index, length
+            index = links[index]
+            length += 1
+        return -1, length
+
+    def _insert(self, key: str, value: object, hash: int, length: int) -> int:
+        """
+        Takes a key that is not in the map, a value, the full hash of the key and the length of its chain as
+        parameters. Reseeds the hash function if the chain would grow too long and grows the table if the load would
+        go above the maximum, both before the entry is added so that its index stays valid. Then adds the entry at
+        the front of its chain, reusing a slot from the free list if there is one. Returns the pool index of the entry.
+        """
+        if length >= self._max_chain and self._reseed_if_flooded():
+            hash = self._hash_function(key)
+        if self._size + 1 > self._capacity * self._max_load:
+            self.resize_table(self._capacity * 2)
+
+        # Take a slot from the free list, or else add one to the end of the pool
+        bucket = hash % self._capacity
+        index = self._free
+        if index != -1:
+            self._free = self._next[index]
+            self._keys[index] = key
+            self._values[index] = value
+            self._hashes[index] = hash
+            self._next[index] = self._heads[bucket]
+        else:
+            index = len(self._keys)
+            self._keys.append(key)
+            self._values.append(value)
+            self._hashes.append(hash)
+            self._next.append(self._heads[bucket])
+
+        # Link the entry in at the front of its chain
+        self._heads[bucket] = index
+        self._size += 1
+        self._mod_count += 1
+        return index
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters; a string that represents a key and an object that represents a value. Puts the key,
+        value pair into the hash map. If the key already exists the value associated with it is updated. Doubles the
+        capacity if the load factor goes above the maximum load threshold. Returns None.
+        """
+        index, inserted = self._find_or_insert(key, value)
+        if not inserted:
+            self._values[index] = value
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """
+        Takes a key and an optional default value as parameters. Returns the value associated with the key, first
+        putting the default into the hash map if the key does not exist. The key is hashed and probed once.
+        """
+        index = self._find_or_insert(key, default)[0]
+        return self._values[index]
+
+    def get_or_put(self, key: str, factory) -> object:
+        """
+        Takes a key and a function taking no arguments as parameters. Returns the value associated with the key. If
+        the key does not exist, the function is called and its result is put into the hash map and returned. The key
+        is hashed and probed once, and nothing is put if the function raises an exception.
+        """
+        hash = self._hash_function(key)
+        index, length = self._probe(key, hash)
+        if index != -1:
+            return self._values[index]
+        mod_count = self._mod_count
+        value = factory()
+
+        # The factory may have changed the map, so only then is the key looked up again before its result is added
+        if self._mod_count != mod_count:
+            index = self._find_or_insert(key, value)[0]
+        else:
+            index = self._insert(key, value, hash, length)
+        return self._values[index]
+
+    def update(self, key: str, function, default: object = None) -> object:
+        """
+        Takes a key, a function taking one argument and an optional default value as parameters. Replaces the value
+        associated with the key by the result of calling the function on it, starting from the default if the key
+        does not exist. The key is hashed and probed once, and nothing is changed if the function raises an exception.
+        Returns the new value.
+        """
+        hash = self._hash_function(key)
+        index, length = self._probe(key, hash)
+        mod_count = self._mod_count
+        value = function(self._values[index] if index != -1 else default)
+
+        # Find the entry again if the function changed the map, and otherwise add the key if it was missing
+        if self._mod_count != mod_count:
+            index = self._find_or_insert(key, value)[0]
+        elif index == -1:
+            index = self._insert(key, value, hash, length)
+        self._values[index] = value
+        return value
+
+    def increment(self, key: str, amount=1):
+        """
+        Takes a key and an optional amount as parameters. Adds the amount to the value associated with the key,
+        starting from 0 if the key does not exist. The key is hashed and probed once, and nothing is changed if the
+        addition raises an exception. Returns the new value.
+        """
+        hash = self._hash_function(key)
+        index, length = self._probe(key, hash)
+        if index != -1:
+            self._values[index] += amount
+            return self._values[index]
+        index = self._insert(key, 0 + amount, hash, length)
+        return self._values[index]
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters. Calculates and returns the number of empty buckets in the hash map.
+        """
+        return self._heads.count(-1)
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters. Calculates and returns the load factor of the table.
+        """
+        return self._size / self._capacity
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears the hash map of any contained data. Returns None.
+        """
+        self._heads = array('l', [-1]) * self._capacity
+        self._keys = []
+        self._values = []
+        self._hashes = []
+        self._next = array('l')
+        self._free = -1
+        self._size = 0
+        self._mod_count += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer as a parameter that represents the new capacity for the hash map. Updates the hash map to
+        have a new capacity and relinks all the entries into the new buckets using the cached hash of each key.
+        Returns None.
+        """
+
+        # Return if the new capacity is too small
+        if new_capacity < 1:
+            return
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Takes an integer representing the new capacity as a parameter. Builds a new head array and a new pool holding
+        only the live entries, so the free list is emptied and the pool is compacted. Keys are already unique, so no
+        duplicate or load checks are made. Returns None.
+        """
+        old_keys, old_values, old_hashes = self._keys, self._values, self._hashes
+        heads = array('l', [-1]) * new_capacity
+        keys, values, hashes, links = [], [], [], array('l')
+
+        # Copy every live entry to the end of the new pool and link it in at the front of its new chain
+        for old_index in range(len(old_keys)):
+            key = old_keys[old_index]
+            if key is _FREE:
+                continue
+            hash = old_hashes[old_index]
+            bucket = hash % new_capacity
+            links.append(heads[bucket])
+            heads[bucket] = len(keys)
+            keys.append(key)
+            values.append(old_values[old_index])
+            hashes.append(hash)
+
+        # Install the new arrays and capacity
+        self._heads, self._keys, self._values, self._hashes, self._next = heads, keys, values, hashes, links
+        self._free = -1
+        self._capacity = new_capacity
+        self._mod_count += 1
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key and attempts to return the value associated with it. If the key does not
+        exist, returns None.
+        """
+        index = self._find(key, self._hash_function(key))
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key and attempts to find that key in the hash map. Returns True if it was found,
+        otherwise returns False.
+        """
+        return self._find(key, self._hash_function(key)) != -1
+
+    def _unlink(self, key: str, hash: int) -> bool:
+        """
+        Takes a key and its full hash as parameters. Unlinks the entry holding the key from its chain, releases the
+        references it holds and puts its slot on the free list. Returns True if the key was found, otherwise False.
+        """
+        keys, hashes, links = self._keys, self._hashes, self._next
+        bucket = hash % self._capacity
+        previous, index = -1, self._heads[bucket]
+        while index != -1:
+            if hashes[index] == hash and keys[index] == key:
+                if previous != -1:
+                    links[previous] = links[index]
+                else:
+                    self._heads[bucket] = links[index]
+
+                # Clear the slot and push it onto the free list
+                keys[index] = _FREE
+                self._values[index] = None
+                hashes[index] = 0
+                links[index] = self._free
+                self._free = index
+                self._size -= 1
+                self._mod_count += 1
+                return True
+            previous, index = index, links[index]
+        return False
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key and attempts to remove the key,value pair from the hash map. Does nothing if
+        key does not exist. Halves the capacity if the load factor drops below the minimum load threshold. Returns
+        None.
+        """
+        if self._unlink(key, self._hash_function(key)):
+            self._shrink_if_sparse()
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Takes no parameters. Halves the capacity, as many times as needed, while the load factor is below the minimum
+        load threshold, without going below the minimum capacity or the capacity given to the constructor. Returns
+        None.
+        """
+        capacity = self._capacity
+        floor = max(self._MIN_CAPACITY, self._initial_capacity)
+        while self._size < capacity * self._min_load and capacity > floor:
+            capacity = max(capacity // 2, floor)
+        if capacity != self._capacity:
+            self.resize_table(capacity)
+
+    def _reseed_if_flooded(self) -> bool:
+        """
+        Takes no parameters. Called when a chain grows longer than _max_chain. If the hash function has a reseeded
+        method and the size has at least doubled since the last reseed, replaces the function with a reseeded copy,
+        recomputes the cached hash of every entry and rehashes the table at the same capacity. Returns True if the
+        map was reseeded, otherwise returns False.
+        """
+        reseeded = getattr(self._hash_function, 'reseeded', None)
+        if reseeded is None or self._size < 2 * self._reseed_size:
+            return False
+
+        # Give every live entry its hash under the new seed
+        self._hash_function = reseeded()
+        hash_function = self._hash_function
+        keys, hashes = self._keys, self._hashes
+        for index in range(len(keys)):
+            if keys[index] is not _FREE:
+                hashes[index] = hash_function(keys[index])
+        self._rehash(self._capacity)
+        self._reseed_size = self._size
+        return True
+
+    def set_chain_limit(self, length: int) -> None:
+        """
+        Takes a positive integer as a parameter. A chain longer than that is treated as a flood of colliding keys and
+        makes the map reseed its hash function, if the function supports it. Does nothing if the value is not
+        positive. Returns None.
+        """
+        if length < 1:
+            return
+        self._max_chain = length
+
+    def set_load_thresholds(self, max_load: float, min_load: float) -> None:
+        """
+        Takes two floats representing the maximum and minimum load factors as parameters. The map grows when its load
+        goes above max_load and shrinks when it drops below min_load; a min_load of 0 disables shrinking. Does nothing
+        unless max_load is positive and min_load is between 0 and a quarter of max_load. Returns None.
+        """
+        if max_load <= 0 or min_load < 0 or min_load > max_load / 4:
+            return
+        self._max_load = max_load
+        self._min_load = min_load
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Creates a Dynamic Array containing all the keys in the hash map, in pool order. Returns
+        the DA.
+        """
+        return DynamicArray([key for key in self._keys if key is not _FREE])
+
+    def _iter_indices(self):
+        """
+        Takes no parameters. Generator that walks the pool and yields the index of each live entry in turn. Raises
+        RuntimeError if the hash map is structurally changed while it is being walked.
+        """
+        mod_count = self._mod_count
+        keys = self._keys
+        for index in range(len(keys)):
+            if self._mod_count != mod_count:
+                raise RuntimeError('HashMap changed during iteration')
+            if keys[index] is not _FREE:
+                yield index
+
+    def keys(self):
+        """
+        Takes no parameters. Generator that lazily yields every key in the hash map.
+        """
+        for index in self._iter_indices():
+            yield self._keys[index]
+
+    def values(self):
+        """
+        Takes no parameters. Generator that lazily yields every value in the hash map.
+        """
+        for index in self._iter_indices():
+            yield self._values[index]
+
+    def items(self):
+        """
+        Takes no parameters. Generator that lazily yields every key,value pair in the hash map as a tuple.
+        """
+        for index in self._iter_indices():
+            yield self._keys[index], self._values[index]
+
+    def __iter__(self):
+        """
+        Return a lazy iterator over the keys of the hash map.
+        """
+        return self.keys()
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Grows the table once for the whole batch, hashes every
+        key in one pass and puts each pair into the hash map. Returns None.
+        """
+        pairs = list(zip(keys, values)) if values is not None else list(keys)
+
+        # Grow the table once so the whole batch fits under the maximum load
+        capacity = self._capacity
+        while self._size + len(pairs) > capacity * self._max_load:
+            capacity *= 2
+        if capacity != self._capacity:
+            self.resize_table(capacity)
+
+        hash_function = self._hash_function
+        hashes = [hash_function(key) for key, _ in pairs]
+
+        # Update each key in its chain, or add a new entry if it is not there
+        for num in range(len(pairs)):
+            key, value = pairs[num]
+            hash = hashes[num]
+            pool_keys, pool_hashes, links = self._keys, self._hashes, self._next
+            index = self._heads[hash % self._capacity]
+            length = 0
+            while index != -1:
+                if pool_hashes[index] == hash and pool_keys[index] == key:
+                    self._values[index] = value
+                    break
+                index = links[index]
+                length += 1
+            else:
+                self._insert(key, value, hash, length)
+
+                # Reseeding changes every hash, so hash the rest of the batch with the new function
+                if self._hash_function is not hash_function:
+                    hash_function = self._hash_function
+                    hashes[num + 1:] = [hash_function(key) for key, _ in pairs[num + 1:]]
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Returns a list holding the value associated with each key, or None
+        for keys that do not exist.
+        """
+        hash_function, values = self._hash_function, self._values
+        results = []
+        for key in keys:
+            index = self._find(key, hash_function(key))
+            results.append(values[index] if index != -1 else None)
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and removes each key,value pair that exists from the hash map. The
+        table is shrunk at most once, after the whole batch. Returns None.
+        """
+        hash_function = self._hash_function
+        for key in keys:
+            self._unlink(key, hash_function(key))
+        self._shrink_if_sparse()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example")
+    print("-----------")
+    m = HashMap(53, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), m.table_load(), m.get_size(), m.get_capacity())
+
+    print("\nget / remove example")
+    print("--------------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(20):
+        m.put(i, i * 10)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    m.remove(7)
+    print(m.get(7), m.contains_key(7), m.get_size())
+    m.put(7, 'seven')
+    print(m.get(7), m.get_size(), m.increment(7, '!'), m.setdefault(30, 300))
+
+    print("\nget_keys example")
+    print("----------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+    m.remove('100')
+    m.resize_table(2)
+    print(m.get_keys(), m.get_size(), m.get_capacity())
+    print(m)
+
+    print("\nlarge sparse map example")
+    print("------------------------")
+    m = HashMap(1_000_000, hash)
+    m.put_many((i * 7919, i) for i in range(1000))
+    print(m.get_size(), m.get_capacity(), m.empty_buckets(), m.get(7919 * 999))
@@ -0,0 +1,318 @@
+# Description: This script contains a ShardedHashMap class that spreads its keys across a number of worker processes.
+# Each worker owns an ordinary HashMap holding the keys of one shard and receives commands over a pipe. The parent
+# process chooses the shard of every key from its built-in hash, which is cheap, splits each batch into one command
+# per shard, sends all of them before waiting for any reply, and merges the replies, so the user hash function and the
+# probing of a large batch run on as many cores as there are shards. The find_mode method counts a large input the
+# same way.
+
+
+import multiprocessing
+
+from hash_map_include import DynamicArray, hash_function_2
+from hash_map_support import mix_hash
+from hash_map_sc import HashMap
+from hash_map_counter import FrequencyTable
+
+
+def _worker(connection, capacity: int, function, map_class) -> None:
+    """
+    Takes the worker end of a pipe, a capacity, a hash function and a HashMap class as parameters. Runs in a worker
+    process, applying each command received to its HashMap and sending back the result, or the exception raised,
+    until it receives a close command. Items sent by count_many are counted in a separate FrequencyTable, which
+    count_mode reports and discards. Returns None.
+    """
+    map = map_class(capacity, function)
+    counts = None
+    while True:
+        name, args = connection.recv()
+        if name == 'close':
+            connection.close()
+            return
+        try:
+            if name == 'count_many':
+                if counts is None:
+                    counts = FrequencyTable(capacity, function, map_class)
+                result = counts.add_many(args[0])
+            elif name == 'count_mode':
+                mode, frequency = counts.mode() if counts is not None else (DynamicArray(), 0)
+                result = ([mode[num] for num in range(mode.length())], frequency)
+                counts = None
+            elif name == 'get_keys':
+                keys = map.get_keys()
+                result = [keys[num] for num in range(keys.length())]
+            else:
+                result = getattr(map, name)(*args)
+            connection.send((True, result))
+        except Exception as exception:
+            connection.send((False, exception))
+
+
+class ShardedHashMap:
+
+    # Batches are sent to the workers in chunks of at most this many keys, so pipes and buffers stay small
+    _chunk_size = 65536
+
+    def __init__(self, capacity: int, function, shards: int = None, map_class=HashMap) -> None:
+        """
+        Initialize new ShardedHashMap with one worker process per shard, which defaults to the number of CPUs. The
+        capacity is split evenly between the shards. The hash function and map_class are sent to the workers, so
+        they must be picklable, which module level functions and classes are.
+        """
+        if shards is None or shards < 1:
+            shards = multiprocessing.cpu_count()
+        self._shards = shards
+        self._connections = []
+        self._processes = []
+        for _ in range(shards):
+            parent_end, worker_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, daemon=True,
+                                              args=(worker_end, max(capacity // shards, 1), function, map_class))
+            process.start()
+            worker_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    def __enter__(self) -> "ShardedHashMap":
+        """
+        Return the map itself so it can be used in a with statement that closes it
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the worker processes when leaving a with statement
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Takes no parameters. Stops every worker process; the map cannot be used afterwards. Returns None.
+        """
+        for connection in self._connections:
+            connection.send(('close', ()))
+            connection.close()
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    # ------------------------------------------------------------------ #
+
+    def _shard(self, key: str) -> int:
+        """
+        Takes a key as a parameter. Returns the index of the shard that owns it, chosen from the high bits of the
+        mixed built-in hash. Only the parent routes keys, so the built-in hash is the same for every call, and the
+        user hash function is left to the workers.
+        """
+        return (mix_hash(hash(key)) >> 32) % self._shards
+
+    def _call(self, shard: int, name: str, *args) -> object:
+        """
+        Takes a shard index, a HashMap method name and its arguments. Runs the method in that shard's worker and
+        returns its result, raising any exception the worker raised.
+        """
+        connection = self._connections[shard]
+        connection.send((name, args))
+        return self._receive(connection)
+
+    @staticmethod
+    def _receive(connection) -> object:
+        """
+        Takes a connection as a parameter. Waits for one reply from its worker. Returns the result, or raises the
+        exception sent by the worker.
+        """
+        ok, result = connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def _broadcast(self, name: str, args_by_shard: list) -> list:
+        """
+        Takes a HashMap method name and a list with the arguments for each shard, or None to skip a shard. Sends every
+        command before waiting for the first reply so the workers run in parallel. Returns a list of the results, with
+        None for skipped shards.
+        """
+        for shard in range(self._shards):
+            if args_by_shard[shard] is not None:
+                self._connections[shard].send((name, args_by_shard[shard]))
+
+        # Collect every reply before raising, so no reply is left waiting in a pipe
+        results = [None] * self._shards
+        error = None
+        for shard in range(self._shards):
+            if args_by_shard[shard] is not None:
+                try:
+                    results[shard] = self._receive(self._connections[shard])
+                except Exception as exception:
+                    error = exception
+        if error is not None:
+            raise error
+        return results
+
+    def _chunks(self, items):
+        """
+        Takes an iterable as a parameter. Generator that yields it as lists of at most _chunk_size items.
+        """
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) == self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes two parameters - a string representing a key and an object representing a value. Put the key,value pair
+        into the shard that owns the key. Each call is a round trip to a worker, so put_many should be preferred for
+        more than a few keys. Returns None.
+        """
+        self._call(self._shard(key), 'put', key, value)
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        return self._call(self._shard(key), 'get', key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        return self._call(self._shard(key), 'contains_key', key)
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a string representing a key as a parameter and attempts to remove it from the table. Returns None.
+        """
+        self._call(self._shard(key), 'remove', key)
+
+    def put_many(self, keys, values=None) -> None:
+        """
+        Takes an iterable of keys and an optional iterable of values of the same length as parameters. If values is
+        omitted, keys must be an iterable of key,value pairs. Splits the pairs by shard and puts them in every worker
+        at once, one chunk at a time. Returns None.
+        """
+        pairs = keys if values is None else zip(keys, values)
+        for chunk in self._chunks(pairs):
+            shard_keys = [[] for _ in range(self._shards)]
+            shard_values = [[] for _ in range(self._shards)]
+            for key, value in chunk:
+                shard = self._shard(key)
+                shard_keys[shard].append(key)
+                shard_values[shard].append(value)
+            self._broadcast('put_many', [(shard_keys[shard], shard_values[shard]) if shard_keys[shard] else None
+                                         for shard in range(self._shards)])
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of keys as a parameter. Looks the keys up in every worker at once, one chunk at a time.
+        Returns a list of the values in the same order as the keys, with None for missing keys.
+        """
+        results = []
+        for chunk in self._chunks(keys):
+            positions = [[] for _ in range(self._shards)]
+            shard_keys = [[] for _ in range(self._shards)]
+            for num in range(len(chunk)):
+                shard = self._shard(chunk[num])
+                positions[shard].append(num)
+                shard_keys[shard].append(chunk[num])
+            found = self._broadcast('get_many', [(shard_keys[shard],) if shard_keys[shard] else None
+                                                 for shard in range(self._shards)])
+
+            # Put each shard's values back in input order
+            chunk_results = [None] * len(chunk)
+            for shard in range(self._shards):
+                if found[shard] is not None:
+                    for num in range(len(positions[shard])):
+                        chunk_results[positions[shard][num]] = found[shard][num]
+            results.extend(chunk_results)
+        return results
+
+    def remove_many(self, keys) -> None:
+        """
+        Takes an iterable of keys as a parameter and removes them from every worker at once, one chunk at a time.
+        Missing keys are ignored. Returns None.
+        """
+        for chunk in self._chunks(keys):
+            shard_keys = [[] for _ in range(self._shards)]
+            for key in chunk:
+                shard_keys[self._shard(key)].append(key)
+            self._broadcast('remove_many', [(shard_keys[shard],) if shard_keys[shard] else None
+                                            for shard in range(self._shards)])
+
+    def get_size(self) -> int:
+        """
+        Return size of map, summed over the shards
+        """
+        return sum(self._broadcast('get_size', [()] * self._shards))
+
+    def clear(self) -> None:
+        """
+        Takes no parameters. Clears every shard of any values. Returns None
+        """
+        self._broadcast('clear', [()] * self._shards)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in every shard. Returns the DA.
+        """
+        keys = DynamicArray()
+        for shard_keys in self._broadcast('get_keys', [()] * self._shards):
+            for key in shard_keys:
+                keys.append(key)
+        return keys
+
+    def find_mode(self, items) -> (DynamicArray, int):
+        """
+        Takes an iterable of hashable items as a parameter. Sends each item to the worker that owns it, one chunk at
+        a time, where all of its occurrences are counted, and merges the mode of every worker into the overall mode.
+        Returns a Dynamic Array containing the mode(s) and the frequency, which is 0 for empty input. The stored keys
+        are not changed.
+        """
+        if isinstance(items, DynamicArray):
+            items = [items[num] for num in range(items.length())]
+        for chunk in self._chunks(items):
+            shard_items = [[] for _ in range(self._shards)]
+            for item in chunk:
+                shard_items[self._shard(item)].append(item)
+            self._broadcast('count_many', [(shard_items[shard],) if shard_items[shard] else None
+                                           for shard in range(self._shards)])
+
+        # Every occurrence of an item is counted by the same worker, so the merged mode is exact
+        mode_da = DynamicArray()
+        total_freq = 0
+        for result in self._broadcast('count_mode', [()] * self._shards):
+            modes, frequency = result
+            if frequency > total_freq:
+                mode_da = DynamicArray()
+                total_freq = frequency
+            if frequency == total_freq and frequency:
+                for mode in modes:
+                    mode_da.append(mode)
+        return mode_da, total_freq
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput_many / get_many example")
+    print("---------------------------")
+    with ShardedHashMap(100, hash_function_2, 4) as m:
+        m.put_many(['str' + str(i) for i in range(1000)], range(1000))
+        print(m.get_size(), m.get_many(['str5', 'str500', 'missing']))
+        m.remove_many(['str' + str(i) for i in range(500)])
+        print(m.get_size(), m.contains_key('str5'), m.get('str999'))
+
+    print("\nfind_mode example")
+    print("-----------------")
+    with ShardedHashMap(10, hash, 3) as m:
+        for case in [['apple', 'apple', 'grape', 'melon', 'melon', 'peach'],
+                     ['Arch', 'Manjaro', 'Manjaro', 'Mint', 'Mint', 'Mint', 'Ubuntu', 'Ubuntu', 'Ubuntu', 'Ubuntu'],
+                     ['one', 'two', 'three', 'four', 'five']]:
+            mode, frequency = m.find_mode(DynamicArray(case))
+            print(f"Input: {case}\nMode: {mode}, Frequency: {frequency}\n")
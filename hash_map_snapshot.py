@@ -0,0 +1,305 @@
+# Description: This script saves any of the HashMaps to a compact, versioned binary snapshot file and loads it back. A
+# snapshot holds a header, an open addressing slot table of record offsets and mixed hashes, and the pickled key,value
+# records. load rebuilds a HashMap from the records and their stored hashes without calling the hash function for
+# them, and MappedHashMap memory-maps the file and answers get and contains_key straight from the mapped pages,
+# unpickling only the records a lookup touches. The slot table is built with the same hash function that is later used
+# to read it, so that function must give the same result in every process; the built-in hash does for integers but not
+# for strings. Records are read with pickle, and unpickling can run arbitrary code, so only load or map snapshots that
+# come from a trusted source.
+
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+import hash_map_oa
+from hash_map_include import DynamicArray, hash_function_2
+from hash_map_support import mix_hash, next_power_of_two
+from hash_map_sc import HashMap
+
+
+# File layout constants. The header is the magic bytes, the format version, the slot count, the number of records
+# and the offset of the first record. Every slot is a record offset (0 for an empty slot) and a mixed hash, and every
+# record is its length followed by the pickled key, value and unmixed hash, which is None if the saved map only
+# cached the mixed one. All integers are little-endian.
+_MAGIC = b'HMAPSNAP'
+_VERSION = 2
+_HEADER = struct.Struct('<8sIIQQ')
+_SLOT = struct.Struct('<QQ')
+_LENGTH = struct.Struct('<I')
+
+
+def _items(map) -> list:
+    """
+    Takes a HashMap as a parameter. Returns a list of its key,value pairs, using the lazy items method when the map
+    has one and get_keys with get otherwise.
+    """
+    if hasattr(map, 'items'):
+        return list(map.items())
+    keys = map.get_keys()
+    return [(keys[num], map.get(keys[num])) for num in range(keys.length())]
+
+
+def _hashed_items(map, function) -> list:
+    """
+    Takes a HashMap and the hash function to index the snapshot with as parameters. Returns a list of (key, value,
+    hash, mixed hash) tuples, where hash is the unmixed hash or None. The hashes cached by separate chaining and open
+    addressing maps are reused when the function is the map's own, and the function is called for every other key.
+    """
+    if function is getattr(map, '_hash_function', None):
+        if isinstance(map, HashMap):
+            return [(node.key, node.value, node.hash, mix_hash(node.hash)) for node in map._iter_nodes()]
+        if isinstance(map, hash_map_oa.HashMap):
+            return [(entry.key, entry.value, None, entry.hash) for entry in map._iter_entries()]
+    items = []
+    for key, value in _items(map):
+        hash = function(key)
+        items.append((key, value, hash, mix_hash(hash)))
+    return items
+
+
+def save(map, path: str, function=None) -> None:
+    """
+    Takes a HashMap, a file path and optionally the hash function to index the snapshot with, which defaults to the
+    map's own function. Writes the snapshot to a temporary file and renames it over the path, so a reader never sees
+    a partly written snapshot. Returns None.
+    """
+    if function is None:
+        function = map._hash_function
+    items = _hashed_items(map, function)
+
+    # Size the slot table to at most half full, and place every record with linear probing
+    slot_count = next_power_of_two(max(len(items) * 2, 1))
+    mask = slot_count - 1
+    slots = array('Q', [0]) * (slot_count * 2)
+    records_offset = _HEADER.size + slot_count * _SLOT.size
+    records = []
+    offset = records_offset
+    for key, value, hash, mixed in items:
+        index = mixed & mask
+        while slots[index * 2] != 0:
+            index = (index + 1) & mask
+        slots[index * 2] = offset
+        slots[index * 2 + 1] = mixed
+        record = pickle.dumps((key, value, hash), pickle.HIGHEST_PROTOCOL)
+        records.append(_LENGTH.pack(len(record)))
+        records.append(record)
+        offset += _LENGTH.size + len(record)
+
+    if sys.byteorder == 'big':
+        slots.byteswap()
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, slot_count, len(items), records_offset))
+            file.write(slots.tobytes())
+            file.writelines(records)
+        os.replace(temp_path, path)
+
+    # Remove the partly written file before passing the error on
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _read_header(buffer) -> (int, int, int):
+    """
+    Takes a buffer holding the start of a snapshot as a parameter. Checks the magic bytes and version. Returns the
+    slot count, the number of records and the offset of the first record, or raises ValueError if the buffer is not a
+    snapshot this version can read.
+    """
+    if len(buffer) < _HEADER.size:
+        raise ValueError('Not a HashMap snapshot')
+    magic, version, slot_count, size, records_offset = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC:
+        raise ValueError('Not a HashMap snapshot')
+    if version != _VERSION:
+        raise ValueError('Unsupported HashMap snapshot version ' + str(version))
+    return slot_count, size, records_offset
+
+
+def _iter_records(buffer, records_offset: int):
+    """
+    Takes a buffer holding a snapshot and the offset of its first record. Generator that yields every key,value pair
+    in the order they were written.
+    """
+    offset = records_offset
+    end = len(buffer)
+    while offset < end:
+        length = _LENGTH.unpack_from(buffer, offset)[0]
+        offset += _LENGTH.size
+        yield pickle.loads(buffer[offset:offset + length])[:2]
+        offset += length
+
+
+def load(path: str, function, map_class=HashMap):
+    """
+    Takes a snapshot path, a hash function and the HashMap class to build as parameters. Creates a map sized for
+    every record and walks the slot table, putting each record into it. Separate chaining and open addressing maps
+    are filled with the hashes stored in the snapshot, so the function must be the one it was saved with, and other
+    maps are filled with put. Records are unpickled, so the snapshot must come from a trusted source. Returns the
+    new map.
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        slot_count, size, records_offset = _read_header(buffer)
+        map = map_class(max(size * 2, 1), function)
+        slots = array('Q', buffer[_HEADER.size:records_offset])
+        if sys.byteorder == 'big':
+            slots.byteswap()
+        records = []
+        for num in range(0, slot_count * 2, 2):
+            offset = slots[num]
+            if offset != 0:
+                length = _LENGTH.unpack_from(buffer, offset)[0]
+                start = offset + _LENGTH.size
+                records.append((pickle.loads(buffer[start:start + length]), slots[num + 1]))
+
+    # Maps that do not cache hashes are filled with their own batch or single puts
+    chaining, open_addressing = isinstance(map, HashMap), isinstance(map, hash_map_oa.HashMap)
+    if not (chaining or open_addressing):
+        pairs = [(key, value) for (key, value, hash), mixed in records]
+        if hasattr(map, 'put_many'):
+            map.put_many(pairs)
+        else:
+            for key, value in pairs:
+                map.put(key, value)
+        return map
+
+    # Fill the map from the stored hashes. A map that reseeds its hash function while filling no longer matches them,
+    # so the rest of the records are put normally.
+    for (key, value, hash), mixed in records:
+        if map._hash_function is not function:
+            map.put(key, value)
+        elif open_addressing:
+            map._put_hashed(key, value, mixed)
+        else:
+            map._put_hashed(key, value, hash if hash is not None else function(key))
+    return map
+
+
+class MappedHashMap:
+    """
+    Read-only HashMap backed by a memory-mapped snapshot. Opening one only reads the header, and each lookup reads
+    the slots on its probe path and unpickles the records whose hash matches, so the operating system pages in only
+    what is used and the mapped pages are shared between processes. Records are unpickled, so the snapshot must come
+    from a trusted source.
+    """
+
+    def __init__(self, path: str, function) -> None:
+        """
+        Initialize new MappedHashMap over the snapshot at path, using the hash function the snapshot was saved with
+        """
+        self._file = open(path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._slot_count, self._size, self._records_offset = _read_header(self._buffer)
+        self._hash_function = function
+
+    def __enter__(self) -> "MappedHashMap":
+        """
+        Return the map itself so it can be used in a with statement that closes it
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the mapping when leaving a with statement
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Takes no parameters. Unmaps the snapshot and closes the file. Returns None.
+        """
+        self._buffer.close()
+        self._file.close()
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return the number of slots in the snapshot
+        """
+        return self._slot_count
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str) -> (bool, object):
+        """
+        Takes a key as a parameter. Probes the mapped slot table, comparing stored hashes before unpickling any
+        record. Returns whether the key was found and its value.
+        """
+        buffer = self._buffer
+        hash = mix_hash(self._hash_function(key))
+        mask = self._slot_count - 1
+        index = hash & mask
+        while True:
+            offset, slot_hash = _SLOT.unpack_from(buffer, _HEADER.size + index * _SLOT.size)
+            if offset == 0:
+                return False, None
+            if slot_hash == hash:
+                length = _LENGTH.unpack_from(buffer, offset)[0]
+                start = offset + _LENGTH.size
+                record_key, value = pickle.loads(buffer[start:start + length])[:2]
+                if record_key == key:
+                    return True, value
+            index = (index + 1) & mask
+
+    def get(self, key: str) -> object:
+        """
+        Takes a string representing a key as a parameters and attempts to find the value associated with it. Returns
+        the value if found, otherwise returns None.
+        """
+        return self._find(key)[1]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a string representing a key as a string and attempts to find it in the table. Returns True if found,
+        otherwise returns False.
+        """
+        return self._find(key)[0]
+
+    def items(self):
+        """
+        Takes no parameters. Generator that lazily yields every key,value pair in the snapshot as a tuple.
+        """
+        return _iter_records(self._buffer, self._records_offset)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters. Generates a Dynamic Array containing all the keys in the snapshot. Returns the DA.
+        """
+        keys = DynamicArray()
+        for key, value in self.items():
+            keys.append(key)
+        return keys
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    print("\nsave / load example")
+    print("-------------------")
+    m = HashMap(50, hash_function_2)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    path = os.path.join(tempfile.mkdtemp(), 'map.snap')
+    save(m, path)
+    m = load(path, hash_function_2)
+    print(m.get_size(), m.get('str42'), m.contains_key('str150'), os.path.getsize(path))
+
+    print("\nMappedHashMap example")
+    print("---------------------")
+    with MappedHashMap(path, hash_function_2) as mapped:
+        print(mapped.get_size(), mapped.get_capacity(), mapped.get('str42'), mapped.get('str150'))
+        print(mapped.contains_key('str0'), mapped.contains_key('str-1'), mapped.get_keys().length())
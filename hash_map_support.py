@@ -0,0 +1,160 @@
+# Description: This script contains the helpers shared by the HashMaps that are not part of the provided data
+# structures in hash_map_include: the TreeBucket that a long separate chaining bucket is converted to, the FreeList
+# that keeps removed nodes and entries for reuse, and the next_power_of_two and mix_hash functions used by the tables
+# whose capacity is a power of two.
+
+
+from bisect import bisect_left, bisect_right
+
+from hash_map_include import SLNode
+
+
+# --------- For use in Separate Chaining (SC) HashMap  --------- #
+
+class TreeBucket:
+    """
+    Bucket that replaces a LinkedList once a chain grows long. Nodes are kept sorted by full hash, and by key among
+    nodes with the same hash, so finding a node takes a binary search instead of a walk along the chain. If two keys
+    with the same hash cannot be ordered, nodes with equal hashes are compared one by one from then on.
+    Supported methods are the same as LinkedList: insert, insert_node, remove, contains, length, iterator
+    """
+
+    __slots__ = ('_hashes', '_keys', '_nodes', '_ordered')
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize new tree bucket holding the given nodes, which are relinked into it."""
+        self._hashes = []
+        self._keys = []
+        self._nodes = []
+        self._ordered = True
+        for node in nodes:
+            self.insert_node(node)
+
+    def __str__(self) -> str:
+        """Override string method to print the bucket the same way as a LinkedList."""
+        return 'SLL [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in sorted order."""
+        return iter(self._nodes)
+
+    def _index(self, key: str, hash: int = None) -> int:
+        """Return the position of the node with matching key, or -1 if no match; without a hash, all are compared."""
+        keys = self._keys
+        if hash is None:
+            low, high = 0, len(keys)
+        else:
+            low = bisect_left(self._hashes, hash)
+            high = bisect_right(self._hashes, hash, low)
+            if high - low > 1 and self._ordered:
+                try:
+                    low = bisect_left(keys, key, low, high)
+                    high = min(low + 1, high)
+                except TypeError:
+                    pass
+        for index in range(low, high):
+            if keys[index] == key:
+                return index
+        return -1
+
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node at its sorted position, caching the full hash of its key."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at its sorted position."""
+        low = bisect_left(self._hashes, node.hash)
+        index = bisect_right(self._hashes, node.hash, low)
+        if index > low and self._ordered:
+            try:
+                index = bisect_right(self._keys, node.key, low, index)
+            except TypeError:
+                self._ordered = False
+        node.next = None
+        self._hashes.insert(index, node.hash)
+        self._keys.insert(index, node.key)
+        self._nodes.insert(index, node)
+
+    def remove(self, key: str, hash: int = None) -> bool:
+        """
+        Remove node with matching key, searching by full hash if it is given.
+        Return True if removal was successful, False otherwise.
+        """
+        return self.remove_node(key, hash) is not None
+
+    def remove_node(self, key: str, hash: int = None) -> SLNode:
+        """Remove node with matching key, as remove does. Return the node, or None if no match."""
+        index = self._index(key, hash)
+        if index == -1:
+            return None
+        node = self._nodes[index]
+        del self._hashes[index]
+        del self._keys[index]
+        del self._nodes[index]
+        return node
+
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """Return node with matching key, or None if no match; searches by full hash if it is given"""
+        index = self._index(key, hash)
+        return self._nodes[index] if index != -1 else None
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+
+# ---------- Free list used by both HashMaps (SC & OA)  ---------- #
+
+class FreeList:
+    """
+    Bounded stack of SLNode or HashEntry objects released by a hash map, so later inserts can reuse them instead of
+    allocating new ones. Released objects have their key, value and hash cleared so they keep nothing alive.
+    Supported methods are: push, pop, length
+    """
+
+    __slots__ = ('_items', '_limit')
+
+    def __init__(self, limit: int = 1024) -> None:
+        """Initialize an empty free list holding at most limit objects."""
+        self._items = []
+        self._limit = limit
+
+    def push(self, item) -> bool:
+        """Keep a released object for reuse. Return False, leaving it to the garbage collector, if the list is full."""
+        if len(self._items) >= self._limit:
+            return False
+        item.key = item.value = item.hash = None
+        self._items.append(item)
+        return True
+
+    def pop(self):
+        """Return a released object, or None if the list is empty."""
+        return self._items.pop() if self._items else None
+
+    def length(self) -> int:
+        """Return the number of objects held."""
+        return len(self._items)
+
+
+# ------------ Used by the power-of-two HashMaps  ------------ #
+
+def next_power_of_two(capacity: int) -> int:
+    """Return the smallest power of two that is at least the given capacity (and at least 1)."""
+    power = 1
+    while power < capacity:
+        power *= 2
+    return power
+
+
+def mix_hash(hash: int) -> int:
+    """
+    Scramble a hash code into 64 bits using the MurmurHash3 finalizer, so every input bit affects the low bits
+    used by a power-of-two bitmask. Weak hashes such as hash_function_1 otherwise leave whole bit patterns unused.
+    """
+    hash &= 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    hash = (hash * 0xFF51AFD7ED558CCD) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    hash = (hash * 0xC4CEB9FE1A85EC53) & 0xFFFFFFFFFFFFFFFF
+    hash ^= hash >> 33
+    return hash